@@ -4,16 +4,53 @@ Cloud Run compatible main file for NJ Health Facility Monitor.
 """
 
 import os
+import time
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
+import orjson
 from flask import Flask, jsonify
+from flask.json.provider import JSONProvider
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Cached (monotonic deadline, ISO timestamp) refreshed at most once per second
+_timestamp_cache = (0.0, '')
+_timestamp_lock = threading.Lock()
+
+def _now_iso():
+    """Return the current UTC time as an ISO string, at one-second resolution."""
+    global _timestamp_cache
+    
+    deadline, timestamp = _timestamp_cache
+    if time.monotonic() < deadline:
+        return timestamp
+    
+    with _timestamp_lock:
+        deadline, timestamp = _timestamp_cache
+        now = time.monotonic()
+        if now >= deadline:
+            current = datetime.now(tz=timezone.utc)
+            timestamp = current.isoformat(timespec='seconds')
+            # Expire at the next wall-clock second boundary
+            deadline = now + 1.0 - current.microsecond / 1_000_000
+            _timestamp_cache = (deadline, timestamp)
+        return timestamp
 
 @app.route('/', methods=['GET'])
 def health_check():
@@ -21,7 +58,7 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "service": "NJ Health Facility Monitor",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     })
 
 @app.route('/test', methods=['GET'])
@@ -30,17 +67,36 @@ def test_endpoint():
     return jsonify({
         "status": "test_successful",
         "message": "PolicyEdge AI Monitor is running!",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     })
 
+# Serializes /check so Cloud Scheduler retries never run a second check concurrently
+_check_lock = threading.Lock()
+
+def _perform_check():
+    """Run a monitoring check and return its JSON-serializable result."""
+    return {
+        "status": "success",
+        "message": "Check endpoint working",
+        "timestamp": _now_iso()
+    }
+
 @app.route('/check', methods=['POST'])
 def run_check():
     """Main check endpoint."""
-    return jsonify({
-        "status": "success",
-        "message": "Check endpoint working",
-        "timestamp": datetime.now().isoformat()
-    })
+    # Only requests that arrive while a check is in flight are duplicates;
+    # once it finishes, the next request runs a fresh check
+    if not _check_lock.acquire(blocking=False):
+        logger.info("Check already running, skipping duplicate request")
+        return jsonify({
+            "status": "already_running",
+            "timestamp": _now_iso()
+        }), 202
+    
+    try:
+        return jsonify(_perform_check())
+    finally:
+        _check_lock.release()
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
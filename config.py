@@ -4,6 +4,7 @@ Configuration settings for NJ Health Facility Enforcement Actions Monitor.
 
 import os
 from datetime import time
+from types import MappingProxyType
 
 class Config:
     """Configuration class with all system settings."""
@@ -18,16 +19,22 @@ class Config:
     
     # Web Scraping Configuration
     REQUEST_TIMEOUT = 30
+    DNS_CACHE_TTL = 900  # Seconds to reuse the scraped host's DNS answer
+    LISTING_CACHE_TTL = 60  # Seconds a fetched listing page is reused across calls
     MAX_RETRIES = 3
     RETRY_DELAY = 5  # seconds
     
     # PDF Processing Configuration
     PDF_DOWNLOAD_TIMEOUT = 60
-    OCR_RESOLUTION_MULTIPLIER = 2.0  # Increase resolution for better OCR
+    OCR_TARGET_DPI = 220  # Page render resolution for OCR, capped by the source scan
+    OCR_MAX_IMAGE_SIDE = 1500  # Longest side, in pixels, of page images sent to OCR
     MAX_PDF_SIZE_MB = 50  # Maximum PDF size to process
+    PDF_CACHE_SIZE = 256  # Parsed PDFs kept in memory, keyed by content hash
     
     # Data Processing Configuration
-    MIN_TEXT_LENGTH_FOR_OCR = 50  # Minimum text length before trying OCR
+    MIN_TEXT_LENGTH_FOR_OCR = 200  # Text layers shorter than this are OCR'd instead
+    MIN_TEXT_ALNUM_RATIO = 0.6  # Share of alphanumeric characters in a usable text layer
+    MIN_TEXT_UNIQUE_TOKENS = 20  # Distinct words in a usable text layer
     MAX_VIOLATIONS_TO_EXTRACT = 10  # Maximum number of violations to extract
     VIOLATION_SUMMARY_MAX_LENGTH = 500  # Maximum length for violation summary
     
@@ -36,8 +43,13 @@ class Config:
     EMAIL_TEMPERATURE = 0.7
     EMAIL_MODEL = "gpt-4"
     
+    # Concurrency Configuration
+    PROCESSING_MAX_WORKERS = 8  # Maximum entries downloaded and parsed in parallel
+    EMAIL_MAX_CONCURRENCY = 8  # Maximum facility emails generated and sent concurrently
+    
     # Database Configuration
     BATCH_SIZE = 10  # Number of entries to process in batch
+    DB_COPY_THRESHOLD = 200  # Batches larger than this use COPY when SUPABASE_DB_URL is set
     MAX_DB_RETRIES = 3
     
     # Logging Configuration
@@ -83,6 +95,14 @@ class Config:
         }
     }
     
+    # Tier bounds for the bonus weights above: minimum penalty in dollars,
+    # minimum key violations, and maximum age in days
+    PRIORITY_THRESHOLDS = {
+        'penalty_amount': {'high': 50000, 'medium': 10000, 'low': 1000},
+        'violations': {'many': 5, 'some': 3, 'few': 1},
+        'recency': {'very_recent': 1, 'recent': 7}
+    }
+    
     # Email Templates
     EMAIL_SUBJECT_TEMPLATES = {
         'single': "NJ Health Facility Enforcement Action - {facility_name}",
@@ -168,3 +188,19 @@ class Config:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
         
         return True
+
+# Immutable module-level views of settings read on hot paths
+HIGH_SEVERITY_KEYWORDS = frozenset(Config.HIGH_SEVERITY_KEYWORDS)
+MEDIUM_SEVERITY_KEYWORDS = frozenset(Config.MEDIUM_SEVERITY_KEYWORDS)
+HIGH_PENALTY_THRESHOLD = Config.HIGH_PENALTY_THRESHOLD
+MEDIUM_PENALTY_THRESHOLD = Config.MEDIUM_PENALTY_THRESHOLD
+PRIORITY_WEIGHTS = MappingProxyType({
+    category: MappingProxyType(weights) for category, weights in Config.PRIORITY_WEIGHTS.items()
+})
+# (bound, points) pairs per bonus category, strongest tier first
+PRIORITY_TIERS = MappingProxyType({
+    category: tuple((bounds[tier], Config.PRIORITY_WEIGHTS[category][tier]) for tier in bounds)
+    for category, bounds in Config.PRIORITY_THRESHOLDS.items()
+})
+REQUIRED_FIELDS = tuple(Config.REQUIRED_FIELDS)
+OPTIONAL_FIELDS = tuple(Config.OPTIONAL_FIELDS)
@@ -2,13 +2,24 @@
 Data processor for structuring and validating parsed enforcement action data.
 """
 
+import hashlib
 import logging
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 
+from config import (
+    HIGH_SEVERITY_KEYWORDS, MEDIUM_SEVERITY_KEYWORDS,
+    HIGH_PENALTY_THRESHOLD, MEDIUM_PENALTY_THRESHOLD, PRIORITY_WEIGHTS, PRIORITY_TIERS,
+    REQUIRED_FIELDS, OPTIONAL_FIELDS
+)
+
 logger = logging.getLogger(__name__)
 
+def _tier_points(tiers, reaches) -> int:
+    """Return the points of the first (bound, points) tier for which reaches(bound) holds, else 0."""
+    return next((points for bound, points in tiers if reaches(bound)), 0)
+
 class DataProcessor:
     """Processes and structures parsed enforcement action data."""
     
@@ -23,28 +34,39 @@ class DataProcessor:
             'Suspension',
             'Amended Notice of Assessment of Penalties'
         ]
+        
+        # Precompiled patterns used on every entry
+        self._non_digit_comma = re.compile(r'[^\d,]')
+        self._non_digit_dot = re.compile(r'[^\d.]')
+        self._penalty_fmt = re.compile(r'^\$?[\d,]+$')
+        
+        # Single scan classifies the action type for both severity and priority
+        self._action_weights = PRIORITY_WEIGHTS['action_type']
+        action_keywords = HIGH_SEVERITY_KEYWORDS | MEDIUM_SEVERITY_KEYWORDS | set(self._action_weights)
+        self._action_class_re = re.compile('|'.join(map(re.escape, sorted(action_keywords))))
+        
+        # Per-field completeness weights: required fields share 60 points, optional 40
+        self._completeness_weights = (
+            tuple((field, 60.0 / len(REQUIRED_FIELDS)) for field in REQUIRED_FIELDS) +
+            tuple((field, 40.0 / len(OPTIONAL_FIELDS)) for field in OPTIONAL_FIELDS)
+        )
     
-    def process_entry(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+    def process_entry(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any],
+                      include_raw: bool = False) -> Dict[str, Any]:
         """
         Process and structure a complete enforcement action entry.
         
         Args:
             web_entry: Data scraped from the website
             pdf_data: Data parsed from the PDF
+            include_raw: Keep the full web and PDF payloads (for debugging)
             
         Returns:
             Structured data ready for storage and email generation
         """
+        processed_data = self._base_record(web_entry, pdf_data, include_raw)
+        
         try:
-            # Merge web and PDF data
-            processed_data = {
-                'id': self._generate_entry_id(web_entry),
-                'scraped_at': datetime.now().isoformat(),
-                'web_data': web_entry,
-                'pdf_data': pdf_data,
-                'structured_data': {}
-            }
-            
             # Extract and structure key information
             structured = self._extract_structured_data(web_entry, pdf_data)
             processed_data['structured_data'] = structured
@@ -58,40 +80,152 @@ class DataProcessor:
             
         except Exception as e:
             logger.error(f"Error processing entry: {str(e)}")
-            return {
-                'id': self._generate_entry_id(web_entry),
-                'scraped_at': datetime.now().isoformat(),
-                'web_data': web_entry,
-                'pdf_data': pdf_data,
-                'structured_data': {},
-                'validation': {'valid': False, 'errors': [str(e)]}
+            processed_data['structured_data'] = {}
+            processed_data['validation'] = {'valid': False, 'errors': [str(e)]}
+            return processed_data
+    
+    def process_entries(self, web_entries: List[Dict[str, Any]], pdf_datas: List[Dict[str, Any]]):
+        """
+        Process a batch of entries into a column-oriented DataFrame.
+        
+        Severity and priority are computed as vectorized column operations and
+        match the per-entry values produced by process_entry.
+        
+        Args:
+            web_entries: Data scraped from the website
+            pdf_datas: Data parsed from the PDFs, aligned with web_entries
+            
+        Returns:
+            pandas.DataFrame with one structured row per entry
+        """
+        import numpy as np
+        import pandas as pd
+        
+        pairs = list(zip(web_entries, pdf_datas))
+        penalty_amounts = [self._extract_penalty_amount(p) for _, p in pairs]
+        key_violations = [p.get('key_violations', []) for _, p in pairs]
+        
+        df = pd.DataFrame({
+            'id': [self._generate_entry_id(w) for w, _ in pairs],
+            'facility_name': [self._extract_facility_name(w, p) for w, p in pairs],
+            'facility_address': [p.get('facility_address', '') for _, p in pairs],
+            'facility_license_number': [p.get('facility_license_number', '') for _, p in pairs],
+            'enforcement_date': [self._format_date(w.get('date')) for w, _ in pairs],
+            'enforcement_action_type': [self._extract_enforcement_type(w, p) for w, p in pairs],
+            'penalty_amount': penalty_amounts,
+            'penalty_num': pd.array([self._parse_penalty_number(a) for a in penalty_amounts], dtype='float64'),
+            'violation_summary': [self._extract_violation_summary(p) for _, p in pairs],
+            'key_violations': key_violations,
+            'effective_date': [p.get('effective_date', '') for _, p in pairs],
+            'contact_information': [p.get('contact_information', '') for _, p in pairs],
+            'pdf_url': [w.get('pdf_url', '') for w, _ in pairs],
+            'administrator_name': [p.get('administrator_name', '') for _, p in pairs],
+            'administrator_first_name': [p.get('administrator_first_name', '') for _, p in pairs],
+            'administrator_email': [p.get('administrator_email', '') for _, p in pairs],
+        })
+        
+        if df.empty:
+            df['severity_level'] = pd.Series(dtype='object')
+            df['priority_score'] = pd.Series(dtype='int64')
+            return df
+        
+        # One C-level substring scan per keyword over the lowered action types
+        action_lower = df['enforcement_action_type'].str.lower()
+        matches = {
+            keyword: action_lower.str.contains(keyword, regex=False).to_numpy()
+            for keyword in HIGH_SEVERITY_KEYWORDS | MEDIUM_SEVERITY_KEYWORDS | set(self._action_weights)
+        }
+        high_kw = np.logical_or.reduce([matches[k] for k in HIGH_SEVERITY_KEYWORDS])
+        medium_kw = np.logical_or.reduce([matches[k] for k in MEDIUM_SEVERITY_KEYWORDS])
+        penalty = df['penalty_num'].to_numpy()
+        
+        # NaN penalties compare False, matching the missing-penalty branch
+        df['severity_level'] = np.select(
+            [high_kw, penalty >= HIGH_PENALTY_THRESHOLD, penalty >= MEDIUM_PENALTY_THRESHOLD, medium_kw],
+            ['HIGH', 'HIGH', 'MEDIUM', 'MEDIUM'],
+            default='LOW'
+        )
+        
+        action_score = np.max(
+            [np.where(matches[k], weight, 0) for k, weight in self._action_weights.items()], axis=0
+        )
+        violation_count = np.fromiter((len(v) for v in key_violations), dtype=np.int64, count=len(key_violations))
+        penalty_score = np.select([penalty >= bound for bound, _ in PRIORITY_TIERS['penalty_amount']],
+                                  [points for _, points in PRIORITY_TIERS['penalty_amount']], default=0)
+        violation_score = np.select([violation_count >= bound for bound, _ in PRIORITY_TIERS['violations']],
+                                    [points for _, points in PRIORITY_TIERS['violations']], default=0)
+        
+        entry_dates = pd.to_datetime(
+            pd.Series([w.get('date') if isinstance(w.get('date'), datetime) else None for w, _ in pairs]),
+            errors='coerce'
+        )
+        days_old = (pd.Timestamp(datetime.now()) - entry_dates).dt.days.to_numpy(dtype='float64', na_value=np.nan)
+        date_score = np.select([days_old <= bound for bound, _ in PRIORITY_TIERS['recency']],
+                               [points for _, points in PRIORITY_TIERS['recency']], default=0)
+        
+        df['priority_score'] = np.minimum(action_score + penalty_score + violation_score + date_score, 100)
+        
+        return df
+    
+    def _base_record(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any],
+                     include_raw: bool) -> Dict[str, Any]:
+        """Build the envelope for a processed entry."""
+        record = {
+            'id': self._generate_entry_id(web_entry),
+            'scraped_at': datetime.now().isoformat(),
+            'structured_data': {}
+        }
+        
+        if include_raw:
+            record['web_data'] = web_entry
+            record['pdf_data'] = pdf_data
+        else:
+            # Downstream consumers only read structured_data
+            record['web_data_summary'] = {
+                'pdf_url': web_entry.get('pdf_url', ''),
+                'date': self._format_date(web_entry.get('date'))
             }
+        
+        return record
     
     def _generate_entry_id(self, web_entry: Dict[str, Any]) -> str:
-        """Generate a unique ID for the entry."""
+        """Generate a stable, fixed-width ID for the entry."""
         facility_name = web_entry.get('facility_name', 'unknown')
         date = web_entry.get('date', datetime.now())
+        date_key = date.date().isoformat() if isinstance(date, datetime) else str(date)
         
-        # Create a hash-based ID
-        id_string = f"{facility_name}_{date.strftime('%Y%m%d')}"
-        return id_string.replace(' ', '_').replace('/', '_').lower()
+        # Hash-based ID doubles as the idempotency key for database upserts
+        id_string = f"{facility_name.strip().lower()}|{date_key}"
+        return hashlib.blake2b(id_string.encode('utf-8'), digest_size=8).hexdigest()
     
     def _extract_structured_data(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract and structure the key data points."""
+        # Derive shared inputs once for severity and priority scoring
+        action_type = self._extract_enforcement_type(web_entry, pdf_data)
+        action_classes = frozenset(self._action_class_re.findall(action_type.lower()))
+        penalty_amount = self._extract_penalty_amount(pdf_data)
+        penalty_num = self._parse_penalty_number(penalty_amount)
+        key_violations = pdf_data.get('key_violations', [])
+        
         structured = {
             'facility_name': self._extract_facility_name(web_entry, pdf_data),
             'facility_address': pdf_data.get('facility_address', ''),
             'facility_license_number': pdf_data.get('facility_license_number', ''),
             'enforcement_date': self._format_date(web_entry.get('date')),
-            'enforcement_action_type': self._extract_enforcement_type(web_entry, pdf_data),
-            'penalty_amount': self._extract_penalty_amount(pdf_data),
+            'enforcement_action_type': action_type,
+            'penalty_amount': penalty_amount,
             'violation_summary': self._extract_violation_summary(pdf_data),
-            'key_violations': pdf_data.get('key_violations', []),
+            'key_violations': key_violations,
             'effective_date': pdf_data.get('effective_date', ''),
             'contact_information': pdf_data.get('contact_information', ''),
             'pdf_url': web_entry.get('pdf_url', ''),
-            'severity_level': self._assess_severity(web_entry, pdf_data),
-            'priority_score': self._calculate_priority_score(web_entry, pdf_data)
+            'administrator_name': pdf_data.get('administrator_name', ''),
+            'administrator_first_name': pdf_data.get('administrator_first_name', ''),
+            'administrator_email': pdf_data.get('administrator_email', ''),
+            'severity_level': self._assess_severity(action_classes, penalty_num),
+            'priority_score': self._calculate_priority_score(
+                action_classes, penalty_num, key_violations, web_entry.get('date')
+            )
         }
         
         return structured
@@ -121,11 +255,20 @@ class DataProcessor:
         penalty = pdf_data.get('penalty_amount', '')
         if penalty:
             # Clean up the penalty amount
-            penalty = re.sub(r'[^\d,]', '', penalty)
+            penalty = self._non_digit_comma.sub('', penalty)
             if penalty:
                 return f"${penalty}"
         return penalty
     
+    def _parse_penalty_number(self, penalty_amount: str) -> Optional[float]:
+        """Parse a formatted penalty amount into a number."""
+        if not penalty_amount:
+            return None
+        try:
+            return float(self._non_digit_dot.sub('', penalty_amount))
+        except ValueError:
+            return None
+    
     def _extract_violation_summary(self, pdf_data: Dict[str, Any]) -> str:
         """Extract a summary of violations."""
         violation_details = pdf_data.get('violation_details', '')
@@ -140,78 +283,44 @@ class DataProcessor:
         
         return ''
     
-    def _assess_severity(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any]) -> str:
+    def _assess_severity(self, action_classes: frozenset, penalty_num: Optional[float]) -> str:
         """Assess the severity level of the enforcement action."""
-        action_type = self._extract_enforcement_type(web_entry, pdf_data).lower()
-        penalty_amount = self._extract_penalty_amount(pdf_data)
-        
         # High severity indicators
-        if any(keyword in action_type for keyword in ['revocation', 'suspension', 'cease']):
+        if action_classes & HIGH_SEVERITY_KEYWORDS:
             return 'HIGH'
         
         # Check penalty amount
-        if penalty_amount:
-            try:
-                amount = float(re.sub(r'[^\d.]', '', penalty_amount))
-                if amount >= 10000:
-                    return 'HIGH'
-                elif amount >= 1000:
-                    return 'MEDIUM'
-            except ValueError:
-                pass
+        if penalty_num is not None:
+            if penalty_num >= HIGH_PENALTY_THRESHOLD:
+                return 'HIGH'
+            elif penalty_num >= MEDIUM_PENALTY_THRESHOLD:
+                return 'MEDIUM'
         
         # Medium severity indicators
-        if any(keyword in action_type for keyword in ['curtailment', 'penalties']):
+        if action_classes & MEDIUM_SEVERITY_KEYWORDS:
             return 'MEDIUM'
         
         return 'LOW'
     
-    def _calculate_priority_score(self, web_entry: Dict[str, Any], pdf_data: Dict[str, Any]) -> int:
+    def _calculate_priority_score(self, action_classes: frozenset, penalty_num: Optional[float],
+                                  key_violations: List[str], entry_date: Optional[datetime]) -> int:
         """Calculate a priority score for the entry (0-100)."""
         score = 0
         
-        # Base score by action type
-        action_type = self._extract_enforcement_type(web_entry, pdf_data).lower()
-        if 'revocation' in action_type or 'suspension' in action_type:
-            score += 40
-        elif 'cease' in action_type:
-            score += 30
-        elif 'curtailment' in action_type:
-            score += 20
-        elif 'penalties' in action_type:
-            score += 15
+        # Base score by action type (strongest matching action wins)
+        score += max((self._action_weights.get(action, 0) for action in action_classes), default=0)
         
         # Penalty amount bonus
-        penalty_amount = self._extract_penalty_amount(pdf_data)
-        if penalty_amount:
-            try:
-                amount = float(re.sub(r'[^\d.]', '', penalty_amount))
-                if amount >= 50000:
-                    score += 30
-                elif amount >= 10000:
-                    score += 20
-                elif amount >= 1000:
-                    score += 10
-            except ValueError:
-                pass
+        if penalty_num is not None:
+            score += _tier_points(PRIORITY_TIERS['penalty_amount'], lambda bound: penalty_num >= bound)
         
         # Number of violations bonus
-        key_violations = pdf_data.get('key_violations', [])
-        if len(key_violations) >= 5:
-            score += 15
-        elif len(key_violations) >= 3:
-            score += 10
-        elif len(key_violations) >= 1:
-            score += 5
+        score += _tier_points(PRIORITY_TIERS['violations'], lambda bound: len(key_violations) >= bound)
         
         # Recent date bonus
-        entry_date = web_entry.get('date')
         if entry_date:
             days_old = (datetime.now() - entry_date).days
-            if days_old <= 1:
-                score += 10
-            elif days_old <= 7:
-                score += 5
+            score += _tier_points(PRIORITY_TIERS['recency'], lambda bound: days_old <= bound)
         
         return min(score, 100)  # Cap at 100
     
@@ -249,7 +358,7 @@ class DataProcessor:
             warnings.append('Missing enforcement date')
         
         # Data quality checks
-        if structured.get('penalty_amount') and not re.match(r'^\$?[\d,]+$', structured['penalty_amount']):
+        if structured.get('penalty_amount') and not self._penalty_fmt.match(structured['penalty_amount']):
             warnings.append('Penalty amount format may be incorrect')
         
         if structured.get('facility_license_number') and len(structured['facility_license_number']) < 3:
@@ -264,16 +373,5 @@ class DataProcessor:
     
     def _calculate_completeness_score(self, structured: Dict[str, Any]) -> float:
         """Calculate a completeness score for the data (0-100)."""
-        required_fields = [
-            'facility_name', 'enforcement_action_type', 'enforcement_date'
-        ]
-        
-        optional_fields = [
-            'facility_address', 'facility_license_number', 'penalty_amount',
-            'violation_summary', 'key_violations', 'effective_date'
-        ]
-        
-        required_score = sum(1 for field in required_fields if structured.get(field)) / len(required_fields) * 60
-        optional_score = sum(1 for field in optional_fields if structured.get(field)) / len(optional_fields) * 40
-        
-        return round(required_score + optional_score, 1)
+        score = sum(weight for field, weight in self._completeness_weights if structured.get(field))
+        return round(score, 1)
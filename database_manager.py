@@ -3,25 +3,139 @@ Database manager for storing enforcement action data in Supabase.
 """
 
 import os
+import copy
+import time
+import random
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from supabase import create_client, Client
-from datetime import datetime
+import threading
+from functools import wraps
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional
+import orjson
+from cachetools import LRUCache, TTLCache
+from datetime import date, datetime, timedelta
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Table holding the enforcement actions
+TABLE = 'enforcement_actions'
+
+# Columns returned by list queries; the raw JSON blobs are left out
+DEFAULT_LIST_COLUMNS = 'id,facility_name,severity_level,priority_score,enforcement_date,enforcement_action_type'
+
+# Columns written by COPY, in table order; JSON columns are sent as serialized text
+COPY_COLUMNS = (
+    'id', 'scraped_at', 'facility_name', 'facility_address', 'facility_license_number',
+    'enforcement_date', 'enforcement_action_type', 'penalty_amount', 'violation_summary',
+    'key_violations', 'effective_date', 'contact_information', 'pdf_url', 'severity_level',
+    'priority_score', 'raw_web_data', 'raw_pdf_data', 'validation'
+)
+_JSON_COLUMNS = frozenset({'key_violations', 'raw_web_data', 'raw_pdf_data', 'validation'})
+
+# Shared Supabase client, created once per process
+_client: Optional['Client'] = None
+_client_lock = threading.Lock()
+
+def _get_client() -> 'Client':
+    """Return the process-wide Supabase client, creating it on first use."""
+    global _client
+    
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                supabase_url = os.getenv('SUPABASE_URL')
+                supabase_key = os.getenv('SUPABASE_KEY')
+                
+                if not supabase_url or not supabase_key:
+                    raise ValueError("Supabase URL and key must be provided in environment variables")
+                
+                # Imported here so modules that only reference DatabaseManager start fast
+                from supabase import create_client
+                from supabase.lib.client_options import ClientOptions
+                
+                options = ClientOptions(postgrest_client_timeout=Config.REQUEST_TIMEOUT)
+                _client = create_client(supabase_url, supabase_key, options=options)
+    
+    return _client
+
+# Results of read-only queries, cleared on every write
+_read_cache = TTLCache(maxsize=512, ttl=300)
+_read_cache_lock = threading.RLock()
+
+def _cached_ttl(method):
+    """
+    Cache a read method's non-empty results in the shared TTL cache.
+    
+    Callers get their own deep copy, so mutating a result cannot change what
+    later callers read.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, frozenset(kwargs.items()))
+        with _read_cache_lock:
+            if key in _read_cache:
+                return copy.deepcopy(_read_cache[key])
+        
+        result = method(self, *args, **kwargs)
+        
+        # Empty results are also what failed queries return, so they are not cached
+        if result:
+            with _read_cache_lock:
+                _read_cache[key] = copy.deepcopy(result)
+        return result
+    
+    return wrapper
+
+def _invalidate_read_cache():
+    """Drop all cached read results after a write."""
+    with _read_cache_lock:
+        _read_cache.clear()
+
+def _to_json_compatible(value: Any) -> Any:
+    """
+    Replace datetimes nested in a payload with ISO strings.
+    
+    supabase-py encodes request bodies with stdlib json, which rejects them;
+    everything else is passed through untouched rather than re-serialized.
+    """
+    if isinstance(value, dict):
+        return {key: _to_json_compatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_compatible(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+# PostgREST's codes for an unreachable database or exhausted pool (HTTP 503/504)
+_TRANSIENT_POSTGREST_CODES = frozenset({'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003'})
+
+def _is_transient_api_error(error) -> bool:
+    """Whether a PostgREST APIError is a rate limit or server-side failure worth retrying."""
+    code = str(error.code or '')
+    # Responses without a JSON body (gateway errors) carry the HTTP status as their
+    # code; five-digit codes are Postgres SQLSTATEs such as 23505 (duplicate key)
+    if len(code) == 3 and code.isdigit():
+        return int(code) == 429 or int(code) >= 500
+    return code in _TRANSIENT_POSTGREST_CODES
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
 class DatabaseManager:
     """Manages database operations for enforcement action data."""
     
     def __init__(self):
         """Initialize the database connection."""
-        self.supabase_url = os.getenv('SUPABASE_URL')
-        self.supabase_key = os.getenv('SUPABASE_KEY')
+        self.supabase: 'Client' = _get_client()
         
-        if not self.supabase_url or not self.supabase_key:
-            raise ValueError("Supabase URL and key must be provided in environment variables")
-        
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        # Fingerprints of entries already stored by this process
+        self._seen = LRUCache(maxsize=10_000)
         
     def store_entry(self, processed_data: Dict[str, Any]) -> bool:
         """
@@ -37,63 +151,263 @@ class DatabaseManager:
             # Prepare data for storage
             db_data = self._prepare_db_data(processed_data)
             
-            # Insert into database
-            result = self.supabase.table('enforcement_actions').insert(db_data).execute()
+            # Skip the round-trip for entries this process already stored
+            fingerprint = self._fingerprint(db_data)
+            if fingerprint in self._seen:
+                logger.info(f"Entry already stored: {db_data['facility_name']}")
+                return True
+            
+            # Upsert on the hash-based ID so a retried request cannot hit a duplicate key
+            result = self._execute(self._table().upsert(
+                db_data, on_conflict='id', ignore_duplicates=True
+            ))
+            _invalidate_read_cache()
+            self._seen[fingerprint] = True
             
             if result.data:
                 logger.info(f"Successfully stored entry: {db_data['facility_name']}")
-                return True
             else:
-                logger.error("Failed to store entry - no data returned")
-                return False
+                logger.info(f"Entry already stored: {db_data['facility_name']}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error storing entry: {str(e)}")
             return False
     
+    def store_entries(self, processed_entries: List[Dict[str, Any]]) -> int:
+        """
+        Store multiple processed entries using batched inserts.
+        
+        Entries whose ID already exists are skipped.
+        
+        Args:
+            processed_entries: The processed entries to store
+            
+        Returns:
+            Number of new entries stored
+        """
+        rows = [self._prepare_db_data(entry) for entry in processed_entries]
+        rows = [row for row in rows if self._fingerprint(row) not in self._seen]
+        stored = 0
+        
+        # Large backfills bypass PostgREST and stream through COPY
+        if len(rows) > Config.DB_COPY_THRESHOLD and os.getenv('SUPABASE_DB_URL'):
+            try:
+                return self.bulk_copy(rows)
+            except Exception as e:
+                logger.error(f"Error copying entries, falling back to batched inserts: {str(e)}")
+        
+        for start in range(0, len(rows), Config.BATCH_SIZE):
+            batch = rows[start:start + Config.BATCH_SIZE]
+            try:
+                # Upsert on the hash-based ID so re-runs don't insert duplicates
+                result = self._execute(self._table().upsert(
+                    batch, on_conflict='id', ignore_duplicates=True
+                ))
+                _invalidate_read_cache()
+                
+                self._mark_seen(batch)
+                stored += len(result.data or [])
+                logger.info(f"Stored batch: {len(result.data or [])} new of {len(batch)} entries")
+                
+            except Exception as e:
+                logger.error(f"Error storing batch: {str(e)}")
+        
+        return stored
+    
+    def bulk_copy(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Store prepared rows with Postgres COPY over a direct connection.
+        
+        Rows are copied into a temporary table and merged with
+        ON CONFLICT DO NOTHING, so existing IDs are skipped as with store_entries.
+        
+        Args:
+            rows: Rows produced by _prepare_db_data
+            
+        Returns:
+            Number of new entries stored
+        """
+        import psycopg
+        
+        columns = ', '.join(COPY_COLUMNS)
+        
+        # prepare_threshold=None disables server-side prepared statements for the pooler
+        with psycopg.connect(os.environ['SUPABASE_DB_URL'], prepare_threshold=None) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"CREATE TEMP TABLE {TABLE}_staging "
+                    f"(LIKE {TABLE} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                
+                with cur.copy(f"COPY {TABLE}_staging ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row([self._copy_value(column, row.get(column)) for column in COPY_COLUMNS])
+                
+                cur.execute(
+                    f"INSERT INTO {TABLE} ({columns}) "
+                    f"SELECT {columns} FROM {TABLE}_staging "
+                    "ON CONFLICT (id) DO NOTHING"
+                )
+                stored = cur.rowcount
+        
+        _invalidate_read_cache()
+        self._mark_seen(rows)
+        logger.info(f"Copied {stored} new of {len(rows)} entries")
+        return stored
+    
+    def _copy_value(self, column: str, value: Any) -> Any:
+        """Convert a prepared value to its COPY representation."""
+        if column in _JSON_COLUMNS:
+            return orjson.dumps(value, default=str).decode()
+        # Empty strings are not valid DATE values
+        if column == 'enforcement_date' and not value:
+            return None
+        return value
+    
+    def _table(self):
+        """Return a fresh query builder for the enforcement actions table."""
+        # Builders accumulate filters, so one is created per query rather than shared
+        return self.supabase.table(TABLE)
+    
+    def _execute(self, query):
+        """
+        Execute a query, retrying transient failures with exponential backoff.
+        
+        Network errors, 429/5xx responses and PostgREST's database-unavailable
+        errors are retried, so only idempotent requests (selects, RPC reads,
+        updates, deletes and upserts on the ID) may be passed here.
+        
+        Args:
+            query: PostgREST request builder
+            
+        Returns:
+            The query response
+        """
+        import httpx
+        from postgrest.exceptions import APIError
+        
+        for attempt in range(Config.MAX_DB_RETRIES + 1):
+            try:
+                return query.execute()
+            except (httpx.TransportError, APIError) as e:
+                if isinstance(e, APIError) and not _is_transient_api_error(e):
+                    raise
+                if attempt == Config.MAX_DB_RETRIES:
+                    raise
+                
+                delay = min(Config.ERROR_BACKOFF_MULTIPLIER ** attempt, Config.MAX_BACKOFF_SECONDS)
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(f"Database request failed ({str(e)}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    def _fingerprint(self, db_data: Dict[str, Any]) -> str:
+        """Fingerprint an entry by its PDF URL and enforcement date."""
+        key = f"{db_data.get('pdf_url', '')}|{db_data.get('enforcement_date', '')}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def is_stored(self, processed_data: Dict[str, Any]) -> bool:
+        """Whether this process has stored the entry or found it already stored."""
+        return self._fingerprint(self._prepare_db_data(processed_data)) in self._seen
+    
+    def _mark_seen(self, rows: List[Dict[str, Any]]) -> None:
+        """Record rows the database now holds, whether inserted or already present."""
+        for row in rows:
+            self._seen[self._fingerprint(row)] = True
+    
+    @_cached_ttl
     def get_entry_by_id(self, entry_id: str) -> Optional[Dict[str, Any]]:
         """Get an entry by its ID."""
         try:
-            result = self.supabase.table('enforcement_actions').select('*').eq('id', entry_id).execute()
+            result = self._execute(self._table().select('*').eq('id', entry_id))
             return result.data[0] if result.data else None
         except Exception as e:
             logger.error(f"Error getting entry by ID: {str(e)}")
             return None
     
-    def get_recent_entries(self, days: int = 7) -> List[Dict[str, Any]]:
+    def get_recent_entries(self, days: int = 7, columns: str = DEFAULT_LIST_COLUMNS) -> List[Dict[str, Any]]:
         """Get recent entries from the last N days."""
         try:
-            cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            cutoff_date = cutoff_date.replace(day=cutoff_date.day - days)
+            cutoff_date = (datetime.now() - timedelta(days=days)).date()
             
-            result = self.supabase.table('enforcement_actions').select('*').gte('enforcement_date', cutoff_date.isoformat()).execute()
+            result = self._execute(self._table().select(columns).gte('enforcement_date', cutoff_date.isoformat()))
             return result.data or []
         except Exception as e:
             logger.error(f"Error getting recent entries: {str(e)}")
             return []
     
-    def get_entries_by_facility(self, facility_name: str) -> List[Dict[str, Any]]:
+    @_cached_ttl
+    def get_entries_by_facility(self, facility_name: str,
+                                columns: str = DEFAULT_LIST_COLUMNS) -> List[Dict[str, Any]]:
         """Get all entries for a specific facility."""
         try:
-            result = self.supabase.table('enforcement_actions').select('*').ilike('facility_name', f'%{facility_name}%').execute()
-            return result.data or []
+            return list(self.iter_entries_by_facility(facility_name, columns=columns))
         except Exception as e:
             logger.error(f"Error getting entries by facility: {str(e)}")
             return []
     
-    def get_high_priority_entries(self) -> List[Dict[str, Any]]:
+    def iter_entries_by_facility(self, facility_name: str, columns: str = DEFAULT_LIST_COLUMNS,
+                                 page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Yield entries for a specific facility, one page at a time.
+        
+        A failed page request raises rather than ending the iteration early.
+        """
+        def query():
+            return (self._table().select(columns)
+                    .ilike('facility_name', f'%{_escape_like(facility_name)}%')
+                    .order('id'))
+        
+        yield from self._paginate(query, page_size)
+    
+    @_cached_ttl
+    def get_high_priority_entries(self, columns: str = DEFAULT_LIST_COLUMNS) -> List[Dict[str, Any]]:
         """Get high priority entries."""
         try:
-            result = self.supabase.table('enforcement_actions').select('*').eq('severity_level', 'HIGH').order('priority_score', desc=True).execute()
-            return result.data or []
+            return list(self.iter_high_priority_entries(columns=columns))
         except Exception as e:
             logger.error(f"Error getting high priority entries: {str(e)}")
             return []
     
+    def iter_high_priority_entries(self, columns: str = DEFAULT_LIST_COLUMNS,
+                                   page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Yield high priority entries, one page at a time.
+        
+        A failed page request raises rather than ending the iteration early.
+        """
+        def query():
+            return (self._table().select(columns)
+                    .eq('severity_level', 'HIGH')
+                    .order('priority_score', desc=True)
+                    .order('id'))
+        
+        yield from self._paginate(query, page_size)
+    
+    def _paginate(self, query, page_size: int) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows from a query using range pagination.
+        
+        Args:
+            query: Callable returning a fresh, ordered query builder
+            page_size: Rows fetched per request
+        """
+        start = 0
+        while True:
+            # postgrest-py 0.13's range() end is exclusive (limit = end - start)
+            page = self._execute(query().range(start, start + page_size))
+            rows = page.data or []
+            yield from rows
+            
+            if len(rows) < page_size:
+                break
+            start += len(rows)
+    
     def update_entry(self, entry_id: str, updates: Dict[str, Any]) -> bool:
         """Update an existing entry."""
         try:
-            result = self.supabase.table('enforcement_actions').update(updates).eq('id', entry_id).execute()
+            result = self._execute(self._table().update(updates).eq('id', entry_id))
+            _invalidate_read_cache()
             return bool(result.data)
         except Exception as e:
             logger.error(f"Error updating entry: {str(e)}")
@@ -102,7 +416,8 @@ class DatabaseManager:
     def delete_entry(self, entry_id: str) -> bool:
         """Delete an entry."""
         try:
-            result = self.supabase.table('enforcement_actions').delete().eq('id', entry_id).execute()
+            result = self._execute(self._table().delete().eq('id', entry_id))
+            _invalidate_read_cache()
             return bool(result.data)
         except Exception as e:
             logger.error(f"Error deleting entry: {str(e)}")
@@ -128,8 +443,10 @@ class DatabaseManager:
             'pdf_url': structured.get('pdf_url', ''),
             'severity_level': structured.get('severity_level', 'LOW'),
             'priority_score': structured.get('priority_score', 0),
-            'raw_web_data': processed_data.get('web_data', {}),
-            'raw_pdf_data': processed_data.get('pdf_data', {}),
+            'raw_web_data': _to_json_compatible(
+                processed_data.get('web_data', processed_data.get('web_data_summary', {}))
+            ),
+            'raw_pdf_data': _to_json_compatible(processed_data.get('pdf_data', {})),
             'validation': processed_data.get('validation', {})
         }
         
@@ -140,39 +457,40 @@ class DatabaseManager:
         try:
             # Note: In Supabase, tables are typically created through the dashboard
             # This method is here for reference and could be used with SQL commands
+            # supabase_schema.sql also creates the pg_trgm GIN index that
+            # get_entries_by_facility's substring ILIKE relies on
             logger.info("Tables should be created through Supabase dashboard")
             return True
         except Exception as e:
             logger.error(f"Error creating tables: {str(e)}")
             return False
     
+    @_cached_ttl
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics."""
         try:
-            # Get total count
-            total_result = self.supabase.table('enforcement_actions').select('id', count='exact').execute()
-            total_count = total_result.count if hasattr(total_result, 'count') else 0
-            
-            # Get recent count (last 30 days)
-            recent_result = self.supabase.table('enforcement_actions').select('id', count='exact').gte('enforcement_date', 
-                (datetime.now().replace(day=datetime.now().day - 30)).isoformat()).execute()
-            recent_count = recent_result.count if hasattr(recent_result, 'count') else 0
-            
-            # Get severity breakdown
-            severity_result = self.supabase.table('enforcement_actions').select('severity_level').execute()
-            severity_breakdown = {}
-            if severity_result.data:
-                for entry in severity_result.data:
-                    level = entry.get('severity_level', 'UNKNOWN')
-                    severity_breakdown[level] = severity_breakdown.get(level, 0) + 1
+            # Counts are aggregated server-side by the stats_summary() SQL function
+            result = self._execute(self.supabase.rpc('stats_summary', {}))
+            summary = result.data or {}
             
             return {
-                'total_entries': total_count,
-                'recent_entries_30_days': recent_count,
-                'severity_breakdown': severity_breakdown,
+                'total_entries': summary.get('total', 0),
+                'recent_entries_30_days': summary.get('recent_30', 0),
+                'severity_breakdown': summary.get('by_severity') or {},
                 'last_updated': datetime.now().isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error getting statistics: {str(e)}")
             return {}
+    
+    @_cached_ttl
+    def get_severity_breakdown(self) -> Dict[str, int]:
+        """Get entry counts per severity level."""
+        try:
+            # Grouped server-side by the severity_breakdown() SQL function
+            result = self._execute(self.supabase.rpc('severity_breakdown', {}))
+            return result.data or {}
+        except Exception as e:
+            logger.error(f"Error getting severity breakdown: {str(e)}")
+            return {}
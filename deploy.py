@@ -6,9 +6,11 @@ Handles installation, configuration, and startup.
 
 import os
 import sys
+import shutil
 import subprocess
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 def setup_logging():
     """Setup logging for deployment."""
@@ -39,31 +41,38 @@ def install_dependencies():
         logger.error(f"Failed to install dependencies: {e}")
         return False
 
+def _probe(binary):
+    """Return (binary, available) by locating it on PATH and running --version."""
+    path = shutil.which(binary)
+    if not path:
+        return binary, False
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, timeout=5)
+        return binary, result.returncode == 0
+    except (subprocess.TimeoutExpired, OSError):
+        return binary, False
+
 def check_system_dependencies():
     """Check for required system dependencies."""
     logger = logging.getLogger(__name__)
     
-    # Check Tesseract
-    try:
-        result = subprocess.run(['tesseract', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            logger.info("✓ Tesseract OCR found")
-        else:
-            logger.warning("⚠ Tesseract OCR not found - OCR functionality will not work")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        logger.warning("⚠ Tesseract OCR not found - OCR functionality will not work")
-    
-    # Check ChromeDriver
-    try:
-        result = subprocess.run(['chromedriver', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            logger.info("✓ ChromeDriver found")
+    dependencies = {
+        'tesseract': ("✓ Tesseract OCR found",
+                      "⚠ Tesseract OCR not found - OCR functionality will not work"),
+        'chromedriver': ("✓ ChromeDriver found",
+                         "⚠ ChromeDriver not found - web scraping may not work"),
+    }
+    
+    # Probe all binaries concurrently; missing ones are rejected without spawning a process
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+        results = list(executor.map(_probe, dependencies))
+    
+    for binary, available in results:
+        found_message, missing_message = dependencies[binary]
+        if available:
+            logger.info(found_message)
         else:
-            logger.warning("⚠ ChromeDriver not found - web scraping may not work")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        logger.warning("⚠ ChromeDriver not found - web scraping may not work")
+            logger.warning(missing_message)
 
 def create_directories():
     """Create necessary directories."""
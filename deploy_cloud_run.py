@@ -5,7 +5,6 @@ Deploy NJ Health Monitor to Google Cloud Run with Cloud Scheduler
 
 import os
 import subprocess
-import json
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -69,11 +68,12 @@ class CloudRunDeployer:
             'containerregistry.googleapis.com'
         ]
         
-        for api in apis:
-            logger.info(f"Enabling {api}...")
-            subprocess.run(['gcloud', 'services', 'enable', api], check=True)
+        # gcloud enables several APIs in a single call
+        logger.info(f"Enabling {', '.join(apis)}...")
+        subprocess.run(['gcloud', 'services', 'enable', *apis, '--project', self.project_id], check=True)
         
         logger.info("✅ APIs enabled")
+        return True
     
     def build_and_push_image(self):
         """Build and push Docker image."""
@@ -162,8 +162,8 @@ class CloudRunDeployer:
         for job in jobs:
             logger.info(f"Creating scheduler job: {job['name']}")
             
-            cmd = [
-                'gcloud', 'scheduler', 'jobs', 'create', 'http', job['name'],
+            job_args = [
+                job['name'],
                 '--schedule', job['schedule'],
                 '--uri', f"{service_url}/check",
                 '--http-method', 'POST',
@@ -171,13 +171,12 @@ class CloudRunDeployer:
                 '--description', job['description']
             ]
             
-            # Delete existing job if it exists
-            subprocess.run([
-                'gcloud', 'scheduler', 'jobs', 'delete', job['name'],
-                '--location', self.region, '--quiet'
-            ], capture_output=True)
+            # Update the job in place if it exists, otherwise create it
+            result = subprocess.run(['gcloud', 'scheduler', 'jobs', 'update', 'http', *job_args],
+                                    capture_output=True)
+            if result.returncode != 0:
+                result = subprocess.run(['gcloud', 'scheduler', 'jobs', 'create', 'http', *job_args])
             
-            result = subprocess.run(cmd)
             if result.returncode == 0:
                 logger.info(f"✅ Scheduler job {job['name']} created")
             else:
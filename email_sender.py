@@ -3,7 +3,10 @@ Email sender using Gmail API and ChatGPT for content generation.
 """
 
 import os
+import time
+import asyncio
 import logging
+import threading
 from typing import Dict, Any, List
 import openai
 from google.auth.transport.requests import Request
@@ -15,8 +18,33 @@ from email.mime.multipart import MIMEMultipart
 import base64
 import json
 
+from config import Config
+
 logger = logging.getLogger(__name__)
 
+class _RateLimiter:
+    """Thread-safe limiter that spaces calls evenly to stay under a per-minute cap."""
+    
+    def __init__(self, requests_per_minute: int):
+        self._interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Reserve the next request slot and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        
+        return slot - now
+    
+    def acquire(self):
+        """Block until the caller may issue its next request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
 class EmailSender:
     """Handles email generation and sending using ChatGPT and Gmail API."""
     
@@ -44,6 +72,13 @@ class EmailSender:
         if not self.sender_email or not self.recipient_email:
             raise ValueError("Sender and recipient emails must be provided in environment variables")
         
+        # Rate limiters shared by concurrent senders
+        self._openai_limiter = _RateLimiter(Config.API_RATE_LIMIT['openai'])
+        self._gmail_limiter = _RateLimiter(Config.API_RATE_LIMIT['gmail'])
+        
+        # The Gmail client's HTTP transport is not thread-safe
+        self._gmail_lock = threading.Lock()
+        
         # Initialize Gmail service
         self.gmail_service = self._initialize_gmail_service()
     
@@ -72,7 +107,7 @@ class EmailSender:
                     token.write(creds.to_json())
             
             # Build the Gmail service
-            service = build('gmail', 'v1', credentials=creds)
+            service = build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
             logger.info("Gmail service initialized successfully")
             return service
             
@@ -92,87 +127,103 @@ class EmailSender:
             Generated email content
         """
         try:
-            # Prepare data for ChatGPT
-            entries_summary = self._prepare_entries_summary(processed_entries)
+            request = self._build_completion_request(processed_entries, custom_prompt)
             
-            # Use custom prompt if provided, otherwise use default
-            if custom_prompt:
-                prompt = self._create_custom_email_prompt(entries_summary, custom_prompt)
-            else:
-                prompt = self._create_email_prompt(entries_summary, len(processed_entries))
+            # Generate email content using ChatGPT
+            self._openai_limiter.acquire()
+            response = self.openai_client.chat.completions.create(**request)
+            
+            return self._handle_completion(response, custom_prompt)
+            
+        except Exception as e:
+            logger.error(f"Error generating email content: {str(e)}")
+            # Fallback to basic email template
+            return self._create_fallback_email(processed_entries)
+    
+    async def generate_email_content_async(self, client: openai.AsyncOpenAI,
+                                           processed_entries: List[Dict[str, Any]],
+                                           custom_prompt: str = None) -> str:
+        """Async variant of generate_email_content using the given async OpenAI client."""
+        try:
+            request = self._build_completion_request(processed_entries, custom_prompt)
             
             # Generate email content using ChatGPT
-            if custom_prompt:
-                # For PolicyEdge custom prompt, expect JSON response
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a business development professional at PolicyEdge. Generate personalized compliance outreach emails in JSON format as specified."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                
-                # Parse JSON response
-                try:
-                    import json
-                    json_response = json.loads(response.choices[0].message.content)
-                    email_subject = json_response.get('email_subject', 'PolicyEdge Risk Intelligence')
-                    email_body = json_response.get('email_body', '')
-                    violation_category = json_response.get('violation_category', '')
-                    
-                    # Replace [Your Name] with actual signature
-                    email_body = self._add_signature(email_body)
-                    
-                    # Format as complete email
-                    email_content = f"Subject: {email_subject}\n\n{email_body}"
-                    logger.info(f"PolicyEdge email generated for violation category: {violation_category}")
-                    
-                except json.JSONDecodeError:
-                    logger.warning("Could not parse JSON response, using raw content")
-                    email_content = response.choices[0].message.content
-                    email_content = self._add_signature(email_content)
-                    
-            else:
-                # Default system prompt for general notifications
-                response = self.openai_client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a professional healthcare compliance analyst. Generate clear, concise email notifications about healthcare facility enforcement actions. Use a professional but accessible tone."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=2000,
-                    temperature=0.7
-                )
-                email_content = response.choices[0].message.content
+            await asyncio.sleep(self._openai_limiter.reserve())
+            response = await client.chat.completions.create(**request)
             
-            logger.info("Email content generated successfully")
-            return email_content
+            return self._handle_completion(response, custom_prompt)
             
         except Exception as e:
             logger.error(f"Error generating email content: {str(e)}")
             # Fallback to basic email template
             return self._create_fallback_email(processed_entries)
     
+    def _build_completion_request(self, processed_entries: List[Dict[str, Any]],
+                                  custom_prompt: str = None) -> Dict[str, Any]:
+        """Build the ChatGPT completion request for the given entries."""
+        # Prepare data for ChatGPT
+        entries_summary = self._prepare_entries_summary(processed_entries)
+        
+        # Use custom prompt if provided, otherwise use default
+        if custom_prompt:
+            prompt = self._create_custom_email_prompt(entries_summary, custom_prompt)
+            # For PolicyEdge custom prompt, expect JSON response
+            system_prompt = "You are a business development professional at PolicyEdge. Generate personalized compliance outreach emails in JSON format as specified."
+        else:
+            prompt = self._create_email_prompt(entries_summary, len(processed_entries))
+            # Default system prompt for general notifications
+            system_prompt = "You are a professional healthcare compliance analyst. Generate clear, concise email notifications about healthcare facility enforcement actions. Use a professional but accessible tone."
+        
+        return {
+            'model': "gpt-4",
+            'messages': [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'max_tokens': 2000,
+            'temperature': 0.7
+        }
+    
+    def _handle_completion(self, response, custom_prompt: str = None) -> str:
+        """Turn a ChatGPT completion into email content."""
+        if custom_prompt:
+            # Parse JSON response
+            try:
+                json_response = json.loads(response.choices[0].message.content)
+                email_subject = json_response.get('email_subject', 'PolicyEdge Risk Intelligence')
+                email_body = json_response.get('email_body', '')
+                violation_category = json_response.get('violation_category', '')
+                
+                # Replace [Your Name] with actual signature
+                email_body = self._add_signature(email_body)
+                
+                # Format as complete email
+                email_content = f"Subject: {email_subject}\n\n{email_body}"
+                logger.info(f"PolicyEdge email generated for violation category: {violation_category}")
+                
+            except json.JSONDecodeError:
+                logger.warning("Could not parse JSON response, using raw content")
+                email_content = response.choices[0].message.content
+                email_content = self._add_signature(email_content)
+        else:
+            email_content = response.choices[0].message.content
+        
+        logger.info("Email content generated successfully")
+        return email_content
+    
     def _prepare_entries_summary(self, processed_entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Prepare a summary of entries for ChatGPT."""
         summary = []
         
         for entry in processed_entries:
             structured = entry.get('structured_data', {})
+            # Raw PDF data is only present for entries processed with include_raw
             pdf_data = entry.get('pdf_data', {})
             
             summary.append({
@@ -184,41 +235,42 @@ class EmailSender:
                 'severity_level': structured.get('severity_level', 'LOW'),
                 'priority_score': structured.get('priority_score', 0),
                 'key_violations': structured.get('key_violations', [])[:3],  # First 3 violations
-                'pdf_data': pdf_data  # Include PDF data for administrator info
+                'administrator_name': structured.get('administrator_name') or pdf_data.get('administrator_name', ''),
+                'administrator_first_name': structured.get('administrator_first_name') or pdf_data.get('administrator_first_name', '')
             })
         
         return summary
     
     def _create_email_prompt(self, entries_summary: List[Dict[str, Any]], count: int) -> str:
         """Create a prompt for ChatGPT to generate email content."""
-        prompt = f"""
+        parts = [f"""
         Generate a professional email notification about {count} new healthcare facility enforcement action(s) in New Jersey.
         
         Here are the details:
         
-        """
+        """]
         
         for i, entry in enumerate(entries_summary, 1):
-            prompt += f"""
+            parts.append(f"""
         {i}. Facility: {entry['facility_name']}
            Action Type: {entry['enforcement_action_type']}
            Date: {entry['enforcement_date']}
            Severity: {entry['severity_level']}
            Priority Score: {entry['priority_score']}/100
-           """
+           """)
             
             if entry['penalty_amount']:
-                prompt += f"           Penalty: {entry['penalty_amount']}\n"
+                parts.append(f"           Penalty: {entry['penalty_amount']}\n")
             
             if entry['violation_summary']:
-                prompt += f"           Violations: {entry['violation_summary'][:200]}...\n"
+                parts.append(f"           Violations: {entry['violation_summary'][:200]}...\n")
             
             if entry['key_violations']:
-                prompt += f"           Key Issues: {'; '.join(entry['key_violations'][:2])}\n"
+                parts.append(f"           Key Issues: {'; '.join(entry['key_violations'][:2])}\n")
             
-            prompt += "\n"
+            parts.append("\n")
         
-        prompt += """
+        parts.append("""
         Please generate a professional email that:
         1. Has a clear, informative subject line
         2. Provides a brief summary of the enforcement actions
@@ -227,9 +279,9 @@ class EmailSender:
         5. Maintains a professional tone suitable for healthcare compliance professionals
         
         Format the email in HTML for better readability.
-        """
+        """)
         
-        return prompt
+        return "".join(parts)
     
     def _create_custom_email_prompt(self, entries_summary: List[Dict[str, Any]], custom_prompt: str) -> str:
         """Create a custom email prompt with the provided template."""
@@ -263,10 +315,9 @@ class EmailSender:
             if not violation_types:
                 violation_types = ['compliance violations']
             
-            # Get administrator information from PDF data
-            pdf_data = entry.get('pdf_data', {}) if 'pdf_data' in entry else {}
-            admin_first_name = pdf_data.get('administrator_first_name', 'Administrator')
-            admin_full_name = pdf_data.get('administrator_name', 'Administrator')
+            # Get administrator information extracted from the PDF
+            admin_first_name = entry.get('administrator_first_name') or 'Administrator'
+            admin_full_name = entry.get('administrator_name') or 'Administrator'
             
             # Replace template variables in the custom prompt
             formatted_prompt = custom_prompt.replace('{{ $json.administrator_first_name }}', admin_first_name)
@@ -286,7 +337,7 @@ class EmailSender:
         """Create a fallback email template if ChatGPT fails."""
         subject = f"NJ Health Facility Enforcement Actions - {len(processed_entries)} New Entries"
         
-        html_content = f"""
+        parts = [f"""
         <html>
         <body>
         <h2>New Jersey Health Facility Enforcement Actions Alert</h2>
@@ -294,7 +345,7 @@ class EmailSender:
         
         <h3>Summary of Actions:</h3>
         <ul>
-        """
+        """]
         
         for entry in processed_entries:
             structured = entry.get('structured_data', {})
@@ -303,16 +354,16 @@ class EmailSender:
             date = structured.get('enforcement_date', 'Unknown Date')
             severity = structured.get('severity_level', 'LOW')
             
-            html_content += f"""
+            parts.append(f"""
             <li>
                 <strong>{facility_name}</strong><br>
                 Action: {action_type}<br>
                 Date: {date}<br>
                 Severity: {severity}
             </li>
-            """
+            """)
         
-        html_content += """
+        parts.append("""
         </ul>
         
         <p>Please review the full details in the attached documents or visit the NJ Department of Health website.</p>
@@ -321,9 +372,9 @@ class EmailSender:
         NJ Health Facility Monitor</p>
         </body>
         </html>
-        """
+        """)
         
-        return f"Subject: {subject}\n\n{html_content}"
+        return f"Subject: {subject}\n\n{''.join(parts)}"
     
     def send_email(self, email_content: str) -> bool:
         """
@@ -353,10 +404,12 @@ class EmailSender:
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
             
             # Send email
-            send_message = self.gmail_service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
+            self._gmail_limiter.acquire()
+            with self._gmail_lock:
+                send_message = self.gmail_service.users().messages().send(
+                    userId='me',
+                    body={'raw': raw_message}
+                ).execute()
             
             logger.info(f"Email sent successfully. Message ID: {send_message['id']}")
             return True
@@ -432,7 +485,8 @@ New York | DC
             pdf_data = processed_entry.get('pdf_data', {})
             
             # Get administrator email (you'll need to extract this from PDFs or use a lookup)
-            admin_email = pdf_data.get('administrator_email', self.recipient_email)
+            admin_email = (structured.get('administrator_email') or
+                           pdf_data.get('administrator_email', self.recipient_email))
             facility_name = structured.get('facility_name', 'Healthcare Facility')
             
             logger.info(f"Generating email for {facility_name}")
@@ -450,6 +504,59 @@ New York | DC
             logger.error(f"Error sending email to facility: {str(e)}")
             return False
     
+    async def send_email_to_facility_async(self, client: openai.AsyncOpenAI, processed_entry: Dict[str, Any],
+                                           custom_prompt: str = None) -> bool:
+        """
+        Async variant of send_email_to_facility.
+        
+        Email generation awaits the given async OpenAI client; the Gmail send runs in
+        the default executor because the Gmail client library is blocking.
+        """
+        try:
+            structured = processed_entry.get('structured_data', {})
+            pdf_data = processed_entry.get('pdf_data', {})
+            
+            admin_email = (structured.get('administrator_email') or
+                           pdf_data.get('administrator_email', self.recipient_email))
+            facility_name = structured.get('facility_name', 'Healthcare Facility')
+            
+            logger.info(f"Generating email for {facility_name}")
+            
+            email_content = await self.generate_email_content_async(client, [processed_entry], custom_prompt)
+            subject, body = self._parse_email_content(email_content)
+            
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._send_gmail, admin_email, subject, body)
+            
+        except Exception as e:
+            logger.error(f"Error sending email to facility: {str(e)}")
+            return False
+    
+    async def send_emails_to_facilities(self, processed_entries: List[Dict[str, Any]],
+                                        custom_prompt: str = None) -> List[bool]:
+        """
+        Send emails to several facilities concurrently.
+        
+        Args:
+            processed_entries: Processed enforcement action entries
+            custom_prompt: Optional custom prompt for email generation
+            
+        Returns:
+            Success flag for each entry, in input order
+        """
+        # The async client's connection pool is bound to the running event loop,
+        # so each call (one asyncio.run per check) gets its own client
+        semaphore = asyncio.Semaphore(
+            max(1, min(Config.EMAIL_MAX_CONCURRENCY, Config.API_RATE_LIMIT['openai'] // 6))
+        )
+        
+        async with openai.AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY')) as client:
+            async def send(entry):
+                async with semaphore:
+                    return await self.send_email_to_facility_async(client, entry, custom_prompt)
+            
+            return await asyncio.gather(*(send(entry) for entry in processed_entries))
+    
     def _send_gmail(self, to_email: str, subject: str, body: str) -> bool:
         """Send email using Gmail API."""
         try:
@@ -467,10 +574,12 @@ New York | DC
             raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
             
             # Send email
-            send_message = self.gmail_service.users().messages().send(
-                userId='me',
-                body={'raw': raw_message}
-            ).execute()
+            self._gmail_limiter.acquire()
+            with self._gmail_lock:
+                send_message = self.gmail_service.users().messages().send(
+                    userId='me',
+                    body={'raw': raw_message}
+                ).execute()
             
             logger.info(f"Email sent successfully to {to_email}. Message ID: {send_message['id']}")
             return True
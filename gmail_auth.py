@@ -4,8 +4,12 @@ Simplified Gmail authentication for PolicyEdge.
 """
 
 import os
-import pickle
+import json
 import base64
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from google.auth.transport.requests import Request
@@ -16,6 +20,17 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Credentials cached in memory so warm invocations skip the token file
+_cached_creds: Optional[Credentials] = None
+_creds_lock = threading.Lock()
+
+def _creds_fresh(creds: Optional[Credentials]) -> bool:
+    """Check that credentials are valid for at least another minute."""
+    if not creds or not creds.valid:
+        return False
+    # google-auth stores expiry as naive UTC
+    return creds.expiry is None or creds.expiry > datetime.utcnow() + timedelta(seconds=60)
+
 class GmailSender:
     """Simplified Gmail sender that handles authentication automatically."""
     
@@ -24,24 +39,46 @@ class GmailSender:
     def __init__(self, sender_email: str = None):
         self.sender_email = sender_email or os.getenv('SENDER_EMAIL')
         self.credentials_file = 'credentials.json'
-        self.token_file = 'token.pickle'
+        self.token_file = 'token.json'
+        # Token store written by earlier versions, migrated to token_file on first use
+        self.legacy_token_file = 'token.pickle'
         self.service = None
+        self._creds = None
+        # Gmail API service objects are not thread-safe, so bulk sends build one per thread
+        self._thread_local = threading.local()
         
         if not self.sender_email:
             raise ValueError("Sender email must be provided")
     
     def authenticate(self):
         """Authenticate with Gmail API."""
+        global _cached_creds
+        
+        with _creds_lock:
+            creds = _cached_creds if _creds_fresh(_cached_creds) else self._load_credentials()
+            _cached_creds = creds
+        
+        self._creds = creds
+        self.service = build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
+        logger.info("Gmail authentication successful")
+        return True
+    
+    def _load_credentials(self) -> Credentials:
+        """Load, refresh or create credentials from the token store."""
         creds = None
         
-        # Load existing token
-        if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+        # Load existing token (GMAIL_TOKEN_JSON lets Cloud Run inject it from Secret Manager)
+        token_json = os.getenv('GMAIL_TOKEN_JSON')
+        if token_json:
+            creds = Credentials.from_authorized_user_info(json.loads(token_json), self.SCOPES)
+        elif os.path.exists(self.token_file):
+            creds = Credentials.from_authorized_user_file(self.token_file, self.SCOPES)
+        elif os.path.exists(self.legacy_token_file):
+            creds = self._migrate_legacy_token()
         
         # If no valid credentials, get new ones
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
+        if not _creds_fresh(creds):
+            if creds and creds.refresh_token:
                 creds.refresh(Request())
             else:
                 if not os.path.exists(self.credentials_file):
@@ -52,12 +89,23 @@ class GmailSender:
                 creds = flow.run_local_server(port=0)
             
             # Save credentials for next run
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            with open(self.token_file, 'w') as token:
+                token.write(creds.to_json())
         
-        self.service = build('gmail', 'v1', credentials=creds)
-        logger.info("Gmail authentication successful")
-        return True
+        return creds
+    
+    def _migrate_legacy_token(self) -> Credentials:
+        """Load credentials from the old pickle token store and rewrite them as JSON."""
+        import pickle
+        
+        # Only ever reads the file this class wrote itself in earlier versions
+        with open(self.legacy_token_file, 'rb') as token:
+            creds = pickle.load(token)
+        
+        with open(self.token_file, 'w') as token:
+            token.write(creds.to_json())
+        logger.info(f"Migrated Gmail token from {self.legacy_token_file} to {self.token_file}")
+        return creds
     
     def send_email(self, to_email: str, subject: str, body: str, is_html: bool = False):
         """Send email via Gmail."""
@@ -65,18 +113,9 @@ class GmailSender:
             if not self.service:
                 self.authenticate()
             
-            # Create message
-            message = MIMEMultipart()
-            message['to'] = to_email
-            message['from'] = self.sender_email
-            message['subject'] = subject
-            
-            # Add body
-            body_type = 'html' if is_html else 'plain'
-            message.attach(MIMEText(body, body_type))
-            
-            # Encode and send
-            raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+            # Create and encode message
+            message = self._build_message(subject, body, is_html)
+            raw_message = self._encode_message(message, to_email)
             
             send_message = self.service.users().messages().send(
                 userId='me',
@@ -90,6 +129,72 @@ class GmailSender:
             logger.error(f"Failed to send email: {str(e)}")
             raise
     
+    def send_bulk(self, recipients: List[str], subject: str, body: str,
+                  is_html: bool = False, max_workers: int = 8) -> Dict[str, Optional[str]]:
+        """
+        Send the same email to several recipients in parallel.
+        
+        Args:
+            recipients: Recipient email addresses
+            subject: Email subject
+            body: Email body
+            is_html: Whether the body is HTML
+            max_workers: Maximum concurrent sends
+            
+        Returns:
+            Mapping of recipient to sent message ID, or None if that send failed
+        """
+        if not recipients:
+            return {}
+        
+        if not self.service:
+            self.authenticate()
+        
+        # Build the MIME body once and only swap the recipient per message
+        message = self._build_message(subject, body, is_html)
+        raw_messages = [(to_email, self._encode_message(message, to_email)) for to_email in recipients]
+        
+        def send(item):
+            to_email, raw_message = item
+            try:
+                sent = self._thread_service().users().messages().send(
+                    userId='me',
+                    body={'raw': raw_message}
+                ).execute()
+                logger.info(f"Email sent successfully to {to_email}")
+                return to_email, sent['id']
+            except Exception as e:
+                logger.error(f"Failed to send email to {to_email}: {str(e)}")
+                return to_email, None
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(raw_messages))) as executor:
+            return dict(executor.map(send, raw_messages))
+    
+    def _build_message(self, subject: str, body: str, is_html: bool = False) -> MIMEMultipart:
+        """Build a message without a recipient."""
+        message = MIMEMultipart()
+        message['from'] = self.sender_email
+        message['subject'] = subject
+        
+        # Add body
+        body_type = 'html' if is_html else 'plain'
+        message.attach(MIMEText(body, body_type))
+        return message
+    
+    def _encode_message(self, message: MIMEMultipart, to_email: str) -> str:
+        """Address the message to a recipient and return it base64url-encoded."""
+        del message['to']
+        message['to'] = to_email
+        return base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+    
+    def _thread_service(self):
+        """Return a Gmail API service owned by the calling thread."""
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            service = build('gmail', 'v1', credentials=self._creds, cache_discovery=False, static_discovery=True)
+            self._thread_local.service = service
+        return service
+    
     def test_connection(self):
         """Test Gmail connection."""
         try:
@@ -103,3 +208,22 @@ class GmailSender:
         except Exception as e:
             logger.error(f"Gmail connection test failed: {str(e)}")
             return False
+
+# Process-wide senders, one per sender address, so credentials and the Gmail
+# service survive across warm requests
+_senders: Dict[str, GmailSender] = {}
+_sender_lock = threading.Lock()
+
+def get_gmail_sender(sender_email: str = None) -> GmailSender:
+    """Return the shared GmailSender for sender_email (default SENDER_EMAIL), creating it on first use."""
+    sender_email = sender_email or os.getenv('SENDER_EMAIL')
+    
+    sender = _senders.get(sender_email)
+    if sender is None:
+        with _sender_lock:
+            sender = _senders.get(sender_email)
+            if sender is None:
+                sender = GmailSender(sender_email)
+                _senders[sender_email] = sender
+    
+    return sender
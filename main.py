@@ -6,7 +6,13 @@ Main application that orchestrates the monitoring, parsing, and notification pro
 
 import os
 import sys
+import asyncio
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property, lru_cache
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -16,6 +22,7 @@ from data_processor import DataProcessor
 from email_sender import EmailSender
 from database_manager import DatabaseManager
 from scheduler import TaskScheduler
+from config import Config
 
 # Load environment variables
 load_dotenv()
@@ -32,18 +39,48 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+CUSTOM_PROMPT_FILE = "custom_prompt.txt"
+
+@lru_cache(maxsize=1)
+def _read_custom_prompt(path, mtime):
+    """Read the custom prompt; cached per (path, mtime) so edits are picked up."""
+    with open(path, 'r') as f:
+        custom_prompt = f.read().strip()
+    logger.info("Loaded custom email prompt from file")
+    return custom_prompt
+
 class NJHealthMonitor:
     """Main class that orchestrates the monitoring process."""
     
     def __init__(self):
-        """Initialize the monitor with all required components."""
-        self.scraper = NJHealthScraper()
-        self.pdf_parser = PDFParser()
+        """Initialize the monitor; heavyweight components are built on first use."""
         self.data_processor = DataProcessor()
-        self.email_sender = EmailSender()
-        self.db_manager = DatabaseManager()
         self.scheduler = TaskScheduler()
         
+        # Parsed PDF data keyed by content hash, bounded LRU
+        self._pdf_cache = OrderedDict()
+        self._pdf_cache_lock = threading.Lock()
+        
+    @cached_property
+    def scraper(self):
+        """Website scraper."""
+        return NJHealthScraper()
+    
+    @cached_property
+    def pdf_parser(self):
+        """PDF parser."""
+        return PDFParser()
+    
+    @cached_property
+    def email_sender(self):
+        """Email sender (authenticates with Gmail on creation)."""
+        return EmailSender()
+    
+    @cached_property
+    def db_manager(self):
+        """Supabase database manager."""
+        return DatabaseManager()
+    
     def run_daily_check(self):
         """Run the daily monitoring check."""
         try:
@@ -55,32 +92,38 @@ class NJHealthMonitor:
             
             if not new_entries:
                 logger.info("No new entries found today.")
+                self.scraper.finish_check()
                 return
             
             logger.info(f"Found {len(new_entries)} new entries")
             
-            # Step 2: Process each new entry
+            # Step 2: Download, parse and process entries concurrently
+            # Build the cached parser on this thread so the workers share one instance
+            _ = self.pdf_parser
             processed_entries = []
-            for entry in new_entries:
+            source_entries = []
+            max_workers = min(len(new_entries), Config.PROCESSING_MAX_WORKERS)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(self._process_entry, entry): entry for entry in new_entries}
+                for future in as_completed(futures):
+                    structured_data = future.result()
+                    if structured_data:
+                        processed_entries.append(structured_data)
+                        source_entries.append(futures[future])
+            
+            # Store all processed entries in batched inserts
+            if processed_entries:
                 try:
-                    logger.info(f"Processing entry: {entry['facility_name']}")
-                    
-                    # Download and parse PDF
-                    pdf_content = self.scraper.download_pdf(entry['pdf_url'])
-                    parsed_data = self.pdf_parser.parse_pdf(pdf_content)
-                    
-                    # Process and structure the data
-                    structured_data = self.data_processor.process_entry(entry, parsed_data)
-                    
-                    # Store in database
-                    self.db_manager.store_entry(structured_data)
-                    
-                    processed_entries.append(structured_data)
-                    logger.info(f"Successfully processed: {entry['facility_name']}")
+                    stored = self.db_manager.store_entries(processed_entries)
+                    logger.info(f"Stored {stored} of {len(processed_entries)} entries in database")
                     
+                    # Only stored entries are skipped from now on; the rest are retried next check
+                    self.scraper.mark_processed([
+                        entry for entry, structured_data in zip(source_entries, processed_entries)
+                        if self.db_manager.is_stored(structured_data)
+                    ])
                 except Exception as e:
-                    logger.error(f"Error processing entry {entry['facility_name']}: {str(e)}")
-                    continue
+                    logger.error(f"Error storing entries: {str(e)}")
             
             # Step 3: Generate and send email if there are new entries
             if processed_entries:
@@ -89,35 +132,88 @@ class NJHealthMonitor:
                 # Load custom prompt if available
                 custom_prompt = self._load_custom_prompt()
                 
-                # Send individual emails to each facility
-                for entry in processed_entries:
-                    try:
-                        success = self.email_sender.send_email_to_facility(entry, custom_prompt)
-                        if success:
-                            facility_name = entry.get('structured_data', {}).get('facility_name', 'Unknown')
-                            logger.info(f"Email sent successfully to {facility_name}")
-                        else:
-                            logger.warning(f"Failed to send email for {facility_name}")
-                    except Exception as e:
-                        logger.error(f"Error sending email: {str(e)}")
+                # Send individual emails to each facility concurrently
+                results = asyncio.run(
+                    self.email_sender.send_emails_to_facilities(processed_entries, custom_prompt)
+                )
+                for entry, success in zip(processed_entries, results):
+                    facility_name = entry.get('structured_data', {}).get('facility_name', 'Unknown')
+                    if success:
+                        logger.info(f"Email sent successfully to {facility_name}")
+                    else:
+                        logger.warning(f"Failed to send email for {facility_name}")
                 
                 logger.info(f"Email notifications completed for {len(processed_entries)} facilities")
             
+            self.scraper.finish_check()
             logger.info("Daily check completed successfully")
             
         except Exception as e:
             logger.error(f"Error in daily check: {str(e)}")
             raise
+        
+        finally:
+            # Persist the check date now; atexit does not run when the container gets SIGTERM.
+            # Only if the scraper was built, so a failure creating it is not masked.
+            if 'scraper' in self.__dict__:
+                self.scraper.flush_last_check_date()
+    
+    def _process_entry(self, entry):
+        """
+        Download, parse and process a single entry.
+        
+        Args:
+            entry: Entry scraped from the website
+            
+        Returns:
+            The processed entry, or None if processing failed
+        """
+        try:
+            logger.info(f"Processing entry: {entry['facility_name']}")
+            
+            # Download and parse PDF
+            pdf_content = self.scraper.download_pdf(entry['pdf_url'])
+            parsed_data = self._parse_pdf_cached(pdf_content)
+            
+            # Process and structure the data
+            structured_data = self.data_processor.process_entry(entry, parsed_data)
+            
+            logger.info(f"Successfully processed: {entry['facility_name']}")
+            return structured_data
+            
+        except Exception as e:
+            logger.error(f"Error processing entry {entry['facility_name']}: {str(e)}")
+            return None
+    
+    def _parse_pdf_cached(self, pdf_content):
+        """Parse a PDF, reusing the result for content that was already parsed."""
+        content_hash = hashlib.blake2b(pdf_content, digest_size=16).hexdigest()
+        
+        with self._pdf_cache_lock:
+            parsed_data = self._pdf_cache.get(content_hash)
+            if parsed_data is not None:
+                self._pdf_cache.move_to_end(content_hash)
+                logger.info("Reusing parsed data for previously seen PDF")
+                return parsed_data
+        
+        parsed_data = self.pdf_parser.parse_pdf(pdf_content)
+        
+        # Don't cache failed parses so they are retried on the next check
+        if parsed_data:
+            with self._pdf_cache_lock:
+                self._pdf_cache[content_hash] = parsed_data
+                if len(self._pdf_cache) > Config.PDF_CACHE_SIZE:
+                    self._pdf_cache.popitem(last=False)
+        
+        return parsed_data
     
     def _load_custom_prompt(self):
         """Load custom prompt from file if available."""
         try:
-            prompt_file = "custom_prompt.txt"
-            if os.path.exists(prompt_file):
-                with open(prompt_file, 'r') as f:
-                    custom_prompt = f.read().strip()
-                    logger.info("Loaded custom email prompt from file")
-                    return custom_prompt
+            mtime = os.stat(CUSTOM_PROMPT_FILE).st_mtime
+            return _read_custom_prompt(CUSTOM_PROMPT_FILE, mtime)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Could not load custom prompt: {str(e)}")
         
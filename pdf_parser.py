@@ -4,24 +4,532 @@ Handles both text-based and scanned PDFs using OCR.
 """
 
 import io
+import os
+import bisect
+import json
+import hashlib
+import atexit
 import logging
-from typing import Dict, Any, Optional
-import PyPDF2
-import pdfplumber
-import pytesseract
-from PIL import Image
-import fitz  # PyMuPDF
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 import re
 
+# PDF and OCR libraries are imported where they are used, so processes that
+# never parse a PDF (the scheduler, the web service) do not pay to load them
+if TYPE_CHECKING:
+    from PIL import Image
+
+from config import Config
+
 logger = logging.getLogger(__name__)
 
+class _PatternFamily:
+    """
+    Prioritized regex variants scanned in a single pass.
+    
+    Each variant is wrapped in a lookahead so the combined pattern reports, at
+    every position, the highest-priority variant matching there. The result
+    equals trying each variant's search() in order and keeping the first hit.
+    """
+    
+    def __init__(self, patterns, flags=0):
+        self._regex = re.compile(
+            '|'.join(f'(?=(?P<p{index}>{pattern}))' for index, pattern in enumerate(patterns)),
+            flags
+        )
+        # Group holding each variant's own first capture (or its full match)
+        self._value_groups = {}
+        for index, pattern in enumerate(patterns):
+            outer = self._regex.groupindex[f'p{index}']
+            self._value_groups[f'p{index}'] = (index, outer + 1 if re.compile(pattern).groups else outer)
+    
+    def search(self, text: str, pos: int = 0, endpos: Optional[int] = None):
+        """Return (variant index, captured text) for the best match, or (None, None)."""
+        best_index, best_value = None, None
+        if endpos is None:
+            endpos = len(text)
+        for match in self._regex.finditer(text, pos, endpos):
+            index, group = self._value_groups[match.lastgroup]
+            if best_index is None or index < best_index:
+                best_index, best_value = index, match.group(group)
+                if index == 0:
+                    break
+        return best_index, best_value
+
+# Text-parsing patterns, compiled once. Lists are ordered by priority: the first match wins.
+_FACILITY_RE = re.compile(r'Facility:\s*(.+?)(?:\n|$)', re.IGNORECASE | re.MULTILINE)
+_ADDRESS_RE = re.compile(r'Address:\s*(.+?)(?:\n|License)', re.IGNORECASE | re.MULTILINE | re.DOTALL)
+_LICENSE_RE = re.compile(r'License\s*#?\s*:?\s*([A-Z0-9-]+)', re.IGNORECASE)
+
+# "assessed penalty of $X" is already matched by the generic "penalty of" pattern
+_PENALTY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'penalty\s*of\s*\$?([0-9,]+)',
+    r'fine\s*of\s*\$?([0-9,]+)',
+    r'\$([0-9,]+)\s*penalty',
+))
+
+# (pattern, enforcement action label)
+_ACTION_PATTERNS = tuple((re.compile(p, re.IGNORECASE), p.replace(r'\s+', ' ')) for p in (
+    r'Notice\s+of\s+Assessment\s+of\s+Penalties',
+    r'Curtailment',
+    r'Cease\s+&\s+Desist',
+    r'Directed\s+Plan\s+of\s+Correction',
+    r'Lifting\s+Curtailment',
+    r'Revocation',
+    r'Suspension',
+))
+
+_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Effective\s+Date:\s*([0-9/]+)',
+    r'Date:\s*([0-9/]+)',
+    r'([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})',
+))
+
+_VIOLATION_SECTION_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in (
+    r'Violations?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    r'Deficiencies?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    r'Findings?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    r'Issues?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+))
+
+# Numbered, bulleted and lettered violation points. Each point runs to the end
+# of its line, so the patterns are line-bounded rather than lazy DOTALL scans
+# that backtrack across the document on noisy OCR output.
+_KEY_VIOLATION_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in (
+    r'^[^\S\n]*[0-9]+\.\s*([^\n]+)',
+    r'^[^\S\n]*[•\-\*]\s*([^\n]+)',
+    r'^[^\S\n]*[a-z]\)\s*([^\n]+)',
+))
+_KEY_VIOLATION_SCAN_CHARS = 50000  # Key points sit near the top of a notice
+
+_CONTACT_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in (
+    r'Contact:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    r'For\s+questions?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    r'Inquiries:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+))
+
+# Administrator name patterns, then signature-like fallbacks. Variants that can
+# only match where an earlier pattern already does (repeats, and "Nursing
+# Home"/"Facility" prefixes under IGNORECASE) are omitted since they could
+# never change the result. Most variants start with a character class rather
+# than a literal, so scanning them as one family beats one search per variant.
+_ADMIN_PATTERNS = _PatternFamily((
+    # "Name, Administrator" or "Name Administrator"
+    r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
+    # "Administrator: Name" or "Administrator Name"
+    r'Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'Administrator\s*[-:]\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    # Contact information patterns
+    r'Contact\s+Person[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    # Other titles
+    r'Director[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'CEO[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'Chief\s+Executive\s+Officer[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    # Name on the line before the Administrator title
+    r'^([A-Z][a-z]+\s+[A-Z][a-z]+)\s*\n.*Administrator',
+    # Signature-like patterns
+    r'Sincerely,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'Best\s+regards,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+    r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(Administrator|Director|CEO)',
+), re.IGNORECASE | re.MULTILINE)
+
+# Every administrator variant contains one of these literals, so a match can
+# only sit in the stretch of text around one of them. The family is run over
+# those stretches instead of the whole document.
+_ADMIN_KEYWORDS_RE = re.compile(
+    r'Administrator|Director|CEO|Contact\s+Person|Chief\s+Executive|Sincerely|Best\s+regards',
+    re.IGNORECASE
+)
+# Before its keyword a match spans name words, whitespace and commas, plus the
+# rest of the keyword's own line ("Name\n... Administrator"); after it, name
+# words, whitespace and ":,-" separators. Anything else bounds the stretch.
+_ADMIN_PREFIX_STOP_RE = re.compile(r'[^\w\s,]')
+_ADMIN_SUFFIX_RE = re.compile(r'[\w\s:,-]*')
+
+def _admin_windows(text: str) -> list:
+    """Return merged [start, end) stretches that contain every possible admin-pattern match."""
+    keywords = list(_ADMIN_KEYWORDS_RE.finditer(text))
+    if not keywords:
+        return []
+    stops = [match.start() for match in _ADMIN_PREFIX_STOP_RE.finditer(text)]
+    
+    windows = []
+    for keyword in keywords:
+        line_start = text.rfind('\n', 0, keyword.start()) + 1
+        stop_index = bisect.bisect_left(stops, line_start)
+        start = stops[stop_index - 1] + 1 if stop_index else 0
+        end = _ADMIN_SUFFIX_RE.match(text, keyword.end()).end()
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    return windows
+
+def _search_admin_patterns(text: str):
+    """Run _ADMIN_PATTERNS around title and sign-off keywords; same result as its search() on the full text."""
+    # Each window holds whole matches, so pos/endpos cannot truncate a capture,
+    # and they keep ^ anchored to real line starts, unlike slicing
+    best_index, best_value = None, None
+    for start, end in _admin_windows(text):
+        index, value = _ADMIN_PATTERNS.search(text, start, end)
+        if index is not None and (best_index is None or index < best_index):
+            best_index, best_value = index, value
+            if index == 0:
+                break
+    return best_index, best_value
+
+# Single-match field patterns that the Hyperscan prefilter screens before re runs
+_PREFILTERED_PATTERNS = (
+    (_FACILITY_RE, _ADDRESS_RE, _LICENSE_RE)
+    + _PENALTY_PATTERNS
+    + tuple(pattern for pattern, _ in _ACTION_PATTERNS)
+    + _DATE_PATTERNS
+    + _VIOLATION_SECTION_PATTERNS
+    + _CONTACT_PATTERNS
+)
+
+class _HyperscanPrefilter:
+    """
+    Report which field patterns can match a text, in one Hyperscan pass.
+    
+    Hyperscan does not return capture groups, so it only screens: patterns it
+    does not report are skipped, and the rest still run through re to extract
+    their values. Patterns are compiled in prefilter mode, which may report
+    extra candidates but never misses a match.
+    """
+    
+    def __init__(self, hyperscan, patterns):
+        self._hyperscan = hyperscan
+        self._ids = {pattern: index for index, pattern in enumerate(patterns)}
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=[pattern.pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            flags=[self._flags(pattern) for pattern in patterns]
+        )
+        # Scratch space may not be shared between concurrent scans
+        self._local = threading.local()
+    
+    def _flags(self, pattern) -> int:
+        hs = self._hyperscan
+        flags = hs.HS_FLAG_PREFILTER | hs.HS_FLAG_SINGLEMATCH | hs.HS_FLAG_UTF8 | hs.HS_FLAG_UCP
+        if pattern.flags & re.IGNORECASE:
+            flags |= hs.HS_FLAG_CASELESS
+        if pattern.flags & re.MULTILINE:
+            flags |= hs.HS_FLAG_MULTILINE
+        if pattern.flags & re.DOTALL:
+            flags |= hs.HS_FLAG_DOTALL
+        return flags
+    
+    def scan(self, text: str) -> set:
+        """Return the patterns that may match the text."""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = self._hyperscan.Scratch(self._database)
+        
+        hits = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(pattern_id)
+            # Stop once every pattern has been seen
+            return len(hits) == len(self._ids)
+        
+        self._database.scan(text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        return {pattern for pattern, index in self._ids.items() if index in hits}
+
+# Built on first parse; False once Hyperscan is known to be unavailable
+_prefilter = None
+_prefilter_lock = threading.Lock()
+
+def _get_prefilter() -> Optional[_HyperscanPrefilter]:
+    """Return the shared Hyperscan prefilter, or None when hyperscan is not installed."""
+    global _prefilter
+    
+    if _prefilter is None:
+        with _prefilter_lock:
+            if _prefilter is None:
+                try:
+                    import hyperscan
+                    _prefilter = _HyperscanPrefilter(hyperscan, _PREFILTERED_PATTERNS)
+                except ImportError:
+                    _prefilter = False
+                except Exception as e:
+                    logger.warning(f"Hyperscan prefilter unavailable, using re only: {str(e)}")
+                    _prefilter = False
+    
+    return _prefilter or None
+
+class _TextSearcher:
+    """Run field searches against one text, skipping patterns the prefilter ruled out."""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._candidates = None
+        
+        prefilter = _get_prefilter()
+        if prefilter is not None:
+            try:
+                self._candidates = prefilter.scan(text)
+            except Exception as e:
+                logger.warning(f"Hyperscan scan failed, using re only: {str(e)}")
+    
+    def search(self, pattern):
+        if self._candidates is not None and pattern not in self._candidates:
+            return None
+        return pattern.search(self.text)
+
+# On-disk cache kind for parse results; bump when _parse_text_content output changes
+_PARSED_CACHE_KIND = 'parsed-v2'
+
+# PDF user space units per inch, and bounds on the OCR render zoom
+_POINTS_PER_INCH = 72
+_MIN_OCR_ZOOM = 1.2
+_MAX_OCR_ZOOM = 3.0
+
+# Shared process pool for page-level OCR, created on first scanned PDF
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+# Persistent tesserocr API owned by an OCR worker process, if tesserocr is installed
+_worker_tess_api = None
+
+# LSTM engine on a single uniform block of text. Pages are OCR'd in parallel,
+# so Tesseract's own OpenMP threads only add contention; this also covers
+# tesseract processes started by pytesseract. An explicit setting still wins.
+_TESSERACT_LANG = 'eng'
+_TESSERACT_CONFIG = '--oem 1 --psm 6 -c preserve_interword_spaces=1'
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+def _create_tess_api():
+    """Create a persistent Tesseract API, or return None when tesserocr is unavailable."""
+    try:
+        import tesserocr
+    except ImportError:
+        return None
+    api = tesserocr.PyTessBaseAPI(lang=_TESSERACT_LANG, psm=tesserocr.PSM.SINGLE_BLOCK,
+                                  oem=tesserocr.OEM.LSTM_ONLY)
+    api.SetVariable('preserve_interword_spaces', '1')
+    return api
+
+def _init_ocr_worker():
+    """Keep each tesseract process single-threaded so pages parallelize cleanly."""
+    global _worker_tess_api
+    
+    # Set before tesserocr loads libtesseract so OpenMP picks it up
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    _worker_tess_api = _create_tess_api()
+    if _worker_tess_api is not None:
+        atexit.register(_worker_tess_api.End)
+
+def _ocr_image(image, tess_api=None) -> str:
+    """OCR an image with a persistent tesserocr API, falling back to the tesseract CLI."""
+    if tess_api is not None:
+        tess_api.SetImage(image)
+        return tess_api.GetUTF8Text()
+    
+    import pytesseract
+    return pytesseract.image_to_string(image, lang=_TESSERACT_LANG, config=_TESSERACT_CONFIG)
+
+def _page_image(page_image) -> 'Image.Image':
+    """Rebuild a page image from the (size, packed pixels) tuple made by _prepare_page_image."""
+    from PIL import Image
+    
+    size, data = page_image
+    return Image.frombytes("1", size, data)
+
+def _ocr_page(page_image) -> str:
+    """OCR one rendered page."""
+    return _ocr_image(_page_image(page_image), _worker_tess_api)
+
+def _ocr_shared_page(task) -> str:
+    """OCR one page whose packed pixels sit in a shared memory block."""
+    name, offset, length, size = task
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(shm.buf[offset:offset + length])
+    finally:
+        shm.close()
+    return _ocr_page((size, data))
+
+def _ocr_pages_shared(pool: ProcessPoolExecutor, page_images: list) -> list:
+    """
+    OCR pages in worker processes, passing pixels through shared memory.
+    
+    All pages are copied into one block, so each task pickles only its offset
+    and size instead of the page pixels.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=sum(len(data) for _, data in page_images))
+    try:
+        tasks = []
+        offset = 0
+        for size, data in page_images:
+            shm.buf[offset:offset + len(data)] = data
+            tasks.append((shm.name, offset, len(data), size))
+            offset += len(data)
+        
+        # map keeps page order
+        return list(pool.map(_ocr_shared_page, tasks, chunksize=1))
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _otsu_threshold(histogram) -> int:
+    """Pick the gray level that best separates text from background (Otsu's method)."""
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    weight_bg = 0
+    sum_bg = 0
+    best_variance = 0.0
+    threshold = 127
+    
+    for level, count in enumerate(histogram):
+        weight_bg += count
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        
+        sum_bg += level * count
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            threshold = level
+    
+    return threshold
+
+def _prepare_page_image(pix):
+    """
+    Convert a grayscale page render to a downscaled black-and-white image for OCR.
+    
+    Returns the image size and its 1-bit packed pixels, which are cheap to send
+    to worker processes without a PNG encode/decode round trip.
+    """
+    from PIL import Image
+    
+    image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    
+    # Tesseract's runtime scales with pixel count
+    side = Config.OCR_MAX_IMAGE_SIDE
+    image.thumbnail((side, side), Image.LANCZOS)
+    
+    threshold = _otsu_threshold(image.histogram())
+    image = image.point([0] * (threshold + 1) + [255] * (255 - threshold), "1")
+    
+    return image.size, image.tobytes()
+
+def _embedded_image_dpi(page) -> Optional[float]:
+    """Resolution of the largest image drawn on a page, or None if it has none."""
+    best_dpi = None
+    best_area = 0.0
+    try:
+        for image in page.get_images(full=True):
+            xref, width = image[0], image[2]
+            for rect in page.get_image_rects(xref):
+                area = rect.width * rect.height
+                if rect.width > 0 and area > best_area:
+                    best_area = area
+                    best_dpi = width * _POINTS_PER_INCH / rect.width
+    except Exception as e:
+        logger.debug(f"Could not read page image placement: {str(e)}")
+    return best_dpi
+
+def _page_zoom(page) -> float:
+    """Pick a render zoom for OCR close to Config.OCR_TARGET_DPI."""
+    dpi = Config.OCR_TARGET_DPI
+    
+    # Rendering a scan above its own resolution only interpolates pixels
+    source_dpi = _embedded_image_dpi(page)
+    if source_dpi:
+        dpi = min(dpi, source_dpi)
+    zoom = dpi / _POINTS_PER_INCH
+    
+    # Pixels past the OCR size limit would be discarded by the downscale
+    longest_side = max(page.rect.width, page.rect.height)
+    if longest_side > 0:
+        zoom = min(zoom, Config.OCR_MAX_IMAGE_SIDE / longest_side)
+    
+    return min(max(zoom, _MIN_OCR_ZOOM), _MAX_OCR_ZOOM)
+
+# Each reader runs in its own function so its parsed document is freed on
+# return, before the next library (or OCR renderer) parses the same bytes.
+# BytesIO over bytes shares the buffer rather than copying it.
+
+def _pypdf_text(pdf_content: bytes) -> str:
+    """Read the native text layer with pypdf."""
+    import pypdf
+    
+    pdf_reader = pypdf.PdfReader(io.BytesIO(pdf_content))
+    parts = [page.extract_text() for page in pdf_reader.pages]
+    return "\n".join(part for part in parts if part)
+
+def _pdfplumber_text(pdf_content: bytes) -> str:
+    """Read the text layer with pdfplumber's layout analysis."""
+    import pdfplumber
+    
+    parts = []
+    with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+        for page in pdf.pages:
+            parts.append(page.extract_text())
+            # Drop the page's cached layout objects once its text is read
+            page.flush_cache()
+    return "\n".join(part for part in parts if part)
+
+def _text_layer_is_usable(text: str) -> bool:
+    """
+    Decide whether extracted text is real content rather than boilerplate or garbage.
+    
+    Scanned PDFs often carry a few stamps or a garbled text layer; those fail
+    the length, alphanumeric-ratio or vocabulary checks and are sent to OCR.
+    """
+    text = text.strip() if text else ''
+    alnum_ratio = sum(c.isalnum() for c in text) / max(1, len(text))
+    unique_tokens = len(set(text.split()))
+    usable = (len(text) >= Config.MIN_TEXT_LENGTH_FOR_OCR
+              and alnum_ratio >= Config.MIN_TEXT_ALNUM_RATIO
+              and unique_tokens >= Config.MIN_TEXT_UNIQUE_TOKENS)
+    logger.debug(f"Text layer check: length={len(text)}, alnum_ratio={alnum_ratio:.2f}, "
+                 f"unique_tokens={unique_tokens}, usable={usable}")
+    return usable
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Return the shared OCR process pool."""
+    global _ocr_pool
+    
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                # spawn avoids forking a process that is running scraper threads
+                _ocr_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_ocr_worker
+                )
+                atexit.register(_ocr_pool.shutdown)
+    
+    return _ocr_pool
+
 class PDFParser:
     """Parser for PDF documents containing enforcement action information."""
     
     def __init__(self):
         # Configure tesseract path if needed (adjust for your system)
         # pytesseract.pytesseract.tesseract_cmd = r'/usr/local/bin/tesseract'
-        pass
+        
+        # Persistent tesserocr API for pages OCR'd in this process, created on first use
+        self._tess = None
+        self._tess_lock = threading.Lock()
+        
+        # Optional on-disk cache of parse results, keyed by the PDF's SHA-256
+        self.cache_dir = os.getenv('PDF_CACHE_DIR')
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
     
     def parse_pdf(self, pdf_content: bytes) -> Dict[str, Any]:
         """
@@ -34,13 +542,30 @@ class PDFParser:
             Dictionary containing parsed information
         """
         try:
+            key = hashlib.sha256(pdf_content).hexdigest() if self.cache_dir else None
+            
+            cached = self._cache_load(key, _PARSED_CACHE_KIND)
+            if cached is not None:
+                logger.info("Using cached parse result")
+                return cached
+            
             # First try to extract text directly
-            text_content = self._extract_text_from_pdf(pdf_content)
+            text_content, usable = self._extract_text_from_pdf(pdf_content)
             
-            if not text_content or len(text_content.strip()) < 50:
-                # If text extraction failed or returned minimal content, try OCR
+            if not usable:
+                # If text extraction failed or returned little real content, try OCR
                 logger.info("Text extraction yielded minimal content, trying OCR...")
-                text_content = self._extract_text_with_ocr(pdf_content)
+                cached_ocr = self._cache_load(key, 'ocr')
+                if cached_ocr is not None:
+                    ocr_text = cached_ocr['text']
+                else:
+                    ocr_text = self._extract_text_with_ocr(pdf_content)
+                    if ocr_text:
+                        self._cache_store(key, 'ocr', {'text': ocr_text})
+                
+                # Keep whatever the text layer had if OCR finds nothing
+                if ocr_text:
+                    text_content = ocr_text
             
             if not text_content:
                 logger.warning("Could not extract any text from PDF")
@@ -48,6 +573,7 @@ class PDFParser:
             
             # Parse the extracted text
             parsed_data = self._parse_text_content(text_content)
+            self._cache_store(key, _PARSED_CACHE_KIND, parsed_data)
             
             return parsed_data
             
@@ -55,66 +581,130 @@ class PDFParser:
             logger.error(f"Error parsing PDF: {str(e)}")
             return {}
     
-    def _extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text from PDF using multiple methods."""
+    def close(self):
+        """Release the persistent Tesseract API, if one was created."""
+        with self._tess_lock:
+            if self._tess:
+                self._tess.End()
+            self._tess = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def _ocr_inline(self, page_image) -> str:
+        """OCR one rendered page in this process."""
+        image = _page_image(page_image)
+        
+        # A Tesseract API instance is not thread-safe, so inline OCR is serialized
+        with self._tess_lock:
+            if self._tess is None:
+                self._tess = _create_tess_api() or False
+            return _ocr_image(image, self._tess or None)
+    
+    def _cache_path(self, key: str, kind: str) -> str:
+        """Path of a cache entry for the given PDF hash."""
+        return os.path.join(self.cache_dir, f"{key}.{kind}.json")
+    
+    def _cache_load(self, key: Optional[str], kind: str) -> Optional[Dict[str, Any]]:
+        """Load a cache entry, or return None if caching is off or the entry is missing."""
+        if not key:
+            return None
+        try:
+            with open(self._cache_path(key, kind), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PDF cache entry: {str(e)}")
+            return None
+    
+    def _cache_store(self, key: Optional[str], kind: str, data: Dict[str, Any]):
+        """Write a cache entry atomically so concurrent readers never see partial files."""
+        if not key:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self._cache_path(key, kind))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write PDF cache entry: {str(e)}")
+    
+    def _extract_text_from_pdf(self, pdf_content: bytes) -> Tuple[str, bool]:
+        """
+        Extract text from PDF using multiple methods.
+        
+        Returns:
+            The extracted text and whether it passes _text_layer_is_usable
+        """
         text_content = ""
         
         try:
-            # Method 1: Using pdfplumber (better for complex layouts)
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
+            # Method 1: Using pypdf (fast, reads the native text layer)
+            text_content = _pypdf_text(pdf_content)
             
-            if text_content.strip():
-                logger.info("Successfully extracted text using pdfplumber")
-                return text_content
+            if _text_layer_is_usable(text_content):
+                logger.info("Successfully extracted text using pypdf")
+                return text_content, True
                 
         except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {str(e)}")
+            logger.warning(f"pypdf extraction failed: {str(e)}")
         
         try:
-            # Method 2: Using PyPDF2 as fallback
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content += page_text + "\n"
+            # Method 2: Using pdfplumber for layout recovery when the text layer is weak
+            plumber_text = _pdfplumber_text(pdf_content)
+            
+            if len(plumber_text.strip()) > len(text_content.strip()):
+                # Only a different text needs a fresh verdict
+                text_content = plumber_text
+                usable = _text_layer_is_usable(text_content)
+            else:
+                usable = False
             
             if text_content.strip():
-                logger.info("Successfully extracted text using PyPDF2")
-                return text_content
+                logger.info("Successfully extracted text using pdfplumber")
+                return text_content, usable
                 
         except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {str(e)}")
+            logger.warning(f"pdfplumber extraction failed: {str(e)}")
         
-        return text_content
+        return text_content, False
     
     def _extract_text_with_ocr(self, pdf_content: bytes) -> str:
         """Extract text from PDF using OCR."""
         try:
-            # Convert PDF to images and apply OCR
+            import fitz  # PyMuPDF
+            
+            # Render pages in this process; rendering is fast compared to OCR
             doc = fitz.open(stream=pdf_content, filetype="pdf")
-            text_content = ""
+            page_images = []
             
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
-                # Convert page to image
-                mat = fitz.Matrix(2.0, 2.0)  # Increase resolution for better OCR
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                
-                # Convert to PIL Image
-                image = Image.open(io.BytesIO(img_data))
-                
-                # Apply OCR
-                page_text = pytesseract.image_to_string(image, config='--psm 6')
-                if page_text:
-                    text_content += page_text + "\n"
+                # Convert page to image at a resolution suited to OCR
+                zoom = _page_zoom(page)
+                mat = fitz.Matrix(zoom, zoom)
+                # Render straight to grayscale; OCR needs no color
+                pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+                page_images.append(_prepare_page_image(pix))
             
             doc.close()
             
+            # Apply OCR, one page per worker process
+            if len(page_images) > 1:
+                page_texts = _ocr_pages_shared(_get_ocr_pool(), page_images)
+            else:
+                page_texts = [self._ocr_inline(image) for image in page_images]
+            
+            text_content = "\n".join(text for text in page_texts if text)
+            
             if text_content.strip():
                 logger.info("Successfully extracted text using OCR")
                 return text_content
@@ -143,74 +733,52 @@ class PDFParser:
         }
         
         try:
+            searcher = _TextSearcher(text)
+            
             # Extract facility name (usually at the beginning)
-            facility_match = re.search(r'Facility:\s*(.+?)(?:\n|$)', text, re.IGNORECASE | re.MULTILINE)
+            facility_match = searcher.search(_FACILITY_RE)
             if facility_match:
                 parsed_data['facility_name'] = facility_match.group(1).strip()
             
             # Extract address
-            address_pattern = r'Address:\s*(.+?)(?:\n|License)'
-            address_match = re.search(address_pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+            address_match = searcher.search(_ADDRESS_RE)
             if address_match:
                 parsed_data['facility_address'] = address_match.group(1).strip()
             
             # Extract license number
-            license_match = re.search(r'License\s*#?\s*:?\s*([A-Z0-9-]+)', text, re.IGNORECASE)
+            license_match = searcher.search(_LICENSE_RE)
             if license_match:
                 parsed_data['facility_license_number'] = license_match.group(1).strip()
             
             # Extract penalty amount
-            penalty_patterns = [
-                r'penalty\s*of\s*\$?([0-9,]+)', 
-                r'fine\s*of\s*\$?([0-9,]+)',
-                r'\$([0-9,]+)\s*penalty',
-                r'assessed\s*penalty\s*of\s*\$?([0-9,]+)'
-            ]
-            
-            for pattern in penalty_patterns:
-                penalty_match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in _PENALTY_PATTERNS:
+                penalty_match = searcher.search(pattern)
                 if penalty_match:
                     parsed_data['penalty_amount'] = penalty_match.group(1).strip()
                     break
             
             # Extract enforcement action type
-            action_patterns = [
-                r'Notice\s+of\s+Assessment\s+of\s+Penalties',
-                r'Curtailment',
-                r'Cease\s+&\s+Desist',
-                r'Directed\s+Plan\s+of\s+Correction',
-                r'Lifting\s+Curtailment',
-                r'Revocation',
-                r'Suspension'
-            ]
-            
-            for pattern in action_patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    parsed_data['enforcement_action_type'] = pattern.replace(r'\s+', ' ')
+            for pattern, label in _ACTION_PATTERNS:
+                if searcher.search(pattern):
+                    parsed_data['enforcement_action_type'] = label
                     break
             
             # Extract violation details (look for common violation patterns)
-            violation_section = self._extract_violation_section(text)
+            violation_section = self._extract_violation_section(searcher)
             parsed_data['violation_details'] = violation_section
             
             # Extract key violations
             parsed_data['key_violations'] = self._extract_key_violations(text)
             
             # Extract effective date
-            date_patterns = [
-                r'Effective\s+Date:\s*([0-9/]+)',
-                r'Date:\s*([0-9/]+)',
-                r'([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})'
-            ]
-            
-            for pattern in date_patterns:
-                date_match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in _DATE_PATTERNS:
+                date_match = searcher.search(pattern)
                 if date_match:
                     parsed_data['effective_date'] = date_match.group(1).strip()
                     break
             
             # Extract contact information
-            contact_info = self._extract_contact_information(text)
+            contact_info = self._extract_contact_information(searcher)
             parsed_data['contact_information'] = contact_info
             
             # Extract administrator information
@@ -225,18 +793,11 @@ class PDFParser:
         
         return parsed_data
     
-    def _extract_violation_section(self, text: str) -> str:
+    def _extract_violation_section(self, searcher: _TextSearcher) -> str:
         """Extract the main violation details section."""
         # Look for common section headers
-        section_patterns = [
-            r'Violations?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
-            r'Deficiencies?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
-            r'Findings?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
-            r'Issues?:\s*(.+?)(?=\n\n|\n[A-Z]|$)'
-        ]
-        
-        for pattern in section_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        for pattern in _VIOLATION_SECTION_PATTERNS:
+            match = searcher.search(pattern)
             if match:
                 return match.group(1).strip()
         
@@ -245,33 +806,23 @@ class PDFParser:
     def _extract_key_violations(self, text: str) -> list:
         """Extract key violation points from the text."""
         violations = []
+        text = text[:_KEY_VIOLATION_SCAN_CHARS]
         
         # Look for numbered or bulleted violation points
-        violation_patterns = [
-            r'(?:^|\n)\s*[0-9]+\.\s*(.+?)(?=\n\s*[0-9]+\.|\n\n|$)',
-            r'(?:^|\n)\s*[•\-\*]\s*(.+?)(?=\n\s*[•\-\*]|\n\n|$)',
-            r'(?:^|\n)\s*[a-z]\)\s*(.+?)(?=\n\s*[a-z]\)|\n\n|$)'
-        ]
-        
-        for pattern in violation_patterns:
-            matches = re.findall(pattern, text, re.MULTILINE | re.DOTALL)
-            for match in matches:
-                violation_text = match.strip()
+        for pattern in _KEY_VIOLATION_PATTERNS:
+            for match in pattern.finditer(text):
+                violation_text = match.group(1).strip()
                 if len(violation_text) > 20:  # Filter out very short matches
                     violations.append(violation_text)
+                    if len(violations) >= Config.MAX_VIOLATIONS_TO_EXTRACT:
+                        return violations
         
-        return violations[:10]  # Limit to first 10 violations
+        return violations
     
-    def _extract_contact_information(self, text: str) -> str:
+    def _extract_contact_information(self, searcher: _TextSearcher) -> str:
         """Extract contact information from the text."""
-        contact_patterns = [
-            r'Contact:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
-            r'For\s+questions?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
-            r'Inquiries:\s*(.+?)(?=\n\n|\n[A-Z]|$)'
-        ]
-        
-        for pattern in contact_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        for pattern in _CONTACT_PATTERNS:
+            match = searcher.search(pattern)
             if match:
                 return match.group(1).strip()
         
@@ -281,75 +832,16 @@ class PDFParser:
         """Extract administrator name information from the text."""
         admin_info = {'full_name': '', 'first_name': ''}
         
-        # Common patterns for administrator names in healthcare facility documents
-        # More flexible patterns to handle various name formats and capitalizations
-        admin_patterns = [
-            # Pattern for "Name, Administrator" or "Name Administrator"
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
-            # Pattern for "Administrator: Name" or "Administrator Name"
-            r'Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            # More specific administrator titles
-            r'Nursing\s+Home\s+Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'Facility\s+Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'Administrator\s*[-:]\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            # Contact information patterns
-            r'Contact\s+Person[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            # Other titles
-            r'Director[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'CEO[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'Chief\s+Executive\s+Officer[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            # More flexible patterns for names at beginning of lines
-            r'^([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
-            r'^([A-Z][a-z]+\s+[A-Z][a-z]+)\s*\n.*Administrator',
-            # Patterns to handle names like "Avraham Ochs" with different formats
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
-            # Pattern for contact blocks with email (like the example you showed)
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator\s*\n.*Health\s+Center',
-            # More general pattern for any capitalized name followed by Administrator
-            r'([A-Z][a-zA-Z]+\s+[A-Z][a-zA-Z]+),?\s*Administrator'
-        ]
-        
-        for pattern in admin_patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                full_name = match.group(1).strip()
-                admin_info['full_name'] = full_name
-                
-                # Extract first name (first word)
-                name_parts = full_name.split()
-                if name_parts:
-                    admin_info['first_name'] = name_parts[0]
-                
-                break
-        
-        # If no specific administrator found, try to extract from signature or contact sections
-        if not admin_info['full_name']:
-            # Look for names in signature-like patterns
-            signature_patterns = [
-                r'Sincerely,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-                r'Best\s+regards,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-                r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(Administrator|Director|CEO)',
-            ]
+        # Try administrator titles first, then signature or contact sections
+        index, full_name = _search_admin_patterns(text)
+        if index is not None:
+            full_name = full_name.strip()
+            admin_info['full_name'] = full_name
             
-            for pattern in signature_patterns:
-                match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-                if match:
-                    full_name = match.group(1).strip()
-                    admin_info['full_name'] = full_name
-                    
-                    # Extract first name
-                    name_parts = full_name.split()
-                    if name_parts:
-                        admin_info['first_name'] = name_parts[0]
-                    
-                    break
-        
-        # Generate a default first name if none found
-        if not admin_info['first_name']:
-            # Use common professional first names as fallback
-            import random
-            default_names = ['Michael', 'Sarah', 'David', 'Jennifer', 'Robert', 'Lisa', 'James', 'Mary', 'John', 'Patricia']
-            admin_info['first_name'] = random.choice(default_names)
-            admin_info['full_name'] = f"{admin_info['first_name']} [Administrator]"
+            # Extract first name (first word)
+            name_parts = full_name.split()
+            if name_parts:
+                admin_info['first_name'] = name_parts[0]
         
+        # Names stay empty when none is found; the email sender picks a salutation
         return admin_info
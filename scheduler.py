@@ -3,7 +3,6 @@ Task scheduler for running daily monitoring checks.
 """
 
 import schedule
-import time
 import logging
 from datetime import datetime, timedelta
 import threading
@@ -17,6 +16,8 @@ class TaskScheduler:
         """Initialize the scheduler."""
         self.running = False
         self.scheduler_thread = None
+        # Set to wake the scheduler loop early (on stop or when jobs change)
+        self._wake = threading.Event()
     
     def schedule_daily_task(self, task_function, time_str="09:00"):
         """
@@ -28,6 +29,7 @@ class TaskScheduler:
         """
         try:
             schedule.every().day.at(time_str).do(self._run_task_with_logging, task_function)
+            self._wake.set()
             logger.info(f"Daily task scheduled for {time_str}")
         except Exception as e:
             logger.error(f"Error scheduling daily task: {str(e)}")
@@ -45,6 +47,7 @@ class TaskScheduler:
             for time_str in time_strings:
                 schedule.every().day.at(time_str).do(self._run_task_with_logging, task_function)
                 logger.info(f"Daily task scheduled for {time_str}")
+            self._wake.set()
             logger.info(f"Scheduled {len(time_strings)} daily checks")
         except Exception as e:
             logger.error(f"Error scheduling multiple daily tasks: {str(e)}")
@@ -54,6 +57,7 @@ class TaskScheduler:
         """Schedule a task to run every hour."""
         try:
             schedule.every().hour.do(self._run_task_with_logging, task_function)
+            self._wake.set()
             logger.info("Hourly task scheduled")
         except Exception as e:
             logger.error(f"Error scheduling hourly task: {str(e)}")
@@ -69,6 +73,7 @@ class TaskScheduler:
         """
         try:
             schedule.every(interval_minutes).minutes.do(self._run_task_with_logging, task_function)
+            self._wake.set()
             logger.info(f"Task scheduled every {interval_minutes} minutes")
         except Exception as e:
             logger.error(f"Error scheduling custom interval task: {str(e)}")
@@ -101,19 +106,32 @@ class TaskScheduler:
     def stop(self):
         """Stop the scheduler."""
         self.running = False
+        self._wake.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         logger.info("Scheduler stopped")
     
     def _run_scheduler(self):
         """Main scheduler loop."""
+        error_delay = 1
+        
         while self.running:
             try:
+                # Sleep until the next job is due instead of polling
+                idle = schedule.idle_seconds()
+                if idle is None or idle > 0:
+                    self._wake.wait(3600 if idle is None else idle)
+                    self._wake.clear()
+                    continue
+                
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                error_delay = 1
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {str(e)}")
-                time.sleep(60)  # Continue running even if there's an error
+                # Continue running even if there's an error, backing off on repeats
+                self._wake.wait(error_delay)
+                self._wake.clear()
+                error_delay = min(error_delay * 2, 300)
     
     def get_next_run_times(self):
         """Get the next run times for all scheduled jobs."""
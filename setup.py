@@ -5,20 +5,53 @@ Setup script for NJ Health Facility Enforcement Actions Monitor.
 
 import os
 import sys
+import shutil
 import subprocess
 import logging
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+def _unsatisfied_requirements(requirements_file="requirements.txt"):
+    """Return requirement lines whose package is missing or not at the pinned version."""
+    # Imported here; only needed when dependencies are checked
+    import re
+    from importlib.metadata import version, PackageNotFoundError
+    
+    unsatisfied = []
+    with open(requirements_file, 'r') as f:
+        for line in f:
+            requirement = line.split('#', 1)[0].strip()
+            if not requirement:
+                continue
+            
+            name, _, pinned = requirement.partition('==')
+            name = re.sub(r'\[.*\]', '', name).strip()
+            try:
+                installed = version(name)
+            except PackageNotFoundError:
+                unsatisfied.append(requirement)
+                continue
+            
+            if pinned and installed != pinned.strip():
+                unsatisfied.append(requirement)
+    
+    return unsatisfied
+
 def install_dependencies():
-    """Install required Python packages."""
+    """Install required Python packages that are missing or at the wrong version."""
     try:
-        logger.info("Installing Python dependencies...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        missing = _unsatisfied_requirements()
+        if not missing:
+            logger.info("All Python dependencies already installed")
+            return True
+        
+        logger.info(f"Installing Python dependencies: {', '.join(missing)}")
+        subprocess.check_call([sys.executable, "-m", "pip", "install",
+                               "--disable-pip-version-check", "--no-input", *missing])
         logger.info("Dependencies installed successfully")
         return True
-    except subprocess.CalledProcessError as e:
+    except (OSError, subprocess.CalledProcessError) as e:
         logger.error(f"Error installing dependencies: {e}")
         return False
 
@@ -47,35 +80,40 @@ def create_env_file():
         logger.warning("No env_example.txt found")
         return False
 
+# Binary -> (found message, missing message)
+_EXTERNAL_TOOLS = {
+    'tesseract': ("Tesseract OCR is installed",
+                  "Tesseract OCR not found. OCR functionality will not work."),
+    'chromedriver': ("ChromeDriver is installed",
+                     "ChromeDriver not found. Web scraping may not work properly."),
+}
+
+def _tool_available(binary):
+    """Check whether an external tool is on PATH, without starting it."""
+    return shutil.which(binary) is not None
+
+def _report_tool(binary, available):
+    """Log whether an external tool was found."""
+    found_message, missing_message = _EXTERNAL_TOOLS[binary]
+    if available:
+        logger.info(found_message)
+    else:
+        logger.warning(missing_message)
+    return available
+
 def check_tesseract():
     """Check if Tesseract OCR is installed."""
-    try:
-        result = subprocess.run(['tesseract', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            logger.info("Tesseract OCR is installed")
-            return True
-        else:
-            logger.warning("Tesseract OCR not found. OCR functionality will not work.")
-            return False
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        logger.warning("Tesseract OCR not found. OCR functionality will not work.")
-        return False
+    return _report_tool('tesseract', _tool_available('tesseract'))
 
 def check_chrome_driver():
     """Check if ChromeDriver is available."""
-    try:
-        result = subprocess.run(['chromedriver', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            logger.info("ChromeDriver is installed")
-            return True
-        else:
-            logger.warning("ChromeDriver not found. Web scraping may not work properly.")
-            return False
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        logger.warning("ChromeDriver not found. Web scraping may not work properly.")
-        return False
+    return _report_tool('chromedriver', _tool_available('chromedriver'))
+
+def check_external_tools():
+    """Check all external tools, logging results in a fixed order."""
+    # PATH lookups take microseconds, so there is nothing to overlap
+    return {binary: _report_tool(binary, _tool_available(binary))
+            for binary in _EXTERNAL_TOOLS}
 
 def create_directories():
     """Create necessary directories."""
@@ -135,8 +173,7 @@ def main():
     create_directories()
     
     # Check external dependencies
-    check_tesseract()
-    check_chrome_driver()
+    check_external_tools()
     
     # Provide setup instructions
     setup_gmail_credentials()
@@ -33,6 +33,10 @@ CREATE INDEX IF NOT EXISTS idx_enforcement_actions_priority_score ON enforcement
 CREATE INDEX IF NOT EXISTS idx_enforcement_actions_scraped_at ON enforcement_actions(scraped_at);
 CREATE INDEX IF NOT EXISTS idx_enforcement_actions_action_type ON enforcement_actions(enforcement_action_type);
 
+-- Trigram index so substring ILIKE searches on facility_name avoid a sequential scan
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_enforcement_actions_facility_name_trgm ON enforcement_actions USING gin (facility_name gin_trgm_ops);
+
 -- Create a function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -93,6 +97,26 @@ SELECT
     MIN(enforcement_date) as earliest_enforcement_date
 FROM enforcement_actions;
 
+-- Create a function returning entry counts per severity level
+CREATE OR REPLACE FUNCTION severity_breakdown()
+RETURNS JSON AS $$
+    SELECT COALESCE(json_object_agg(severity_level, c), '{}'::json)
+    FROM (SELECT severity_level, COUNT(*) AS c
+          FROM enforcement_actions
+          GROUP BY 1) s;
+$$ LANGUAGE sql STABLE;
+
+-- Create a function returning the statistics summary in a single call
+CREATE OR REPLACE FUNCTION stats_summary()
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'total', (SELECT COUNT(*) FROM enforcement_actions),
+        'recent_30', (SELECT COUNT(*) FROM enforcement_actions
+                      WHERE enforcement_date >= CURRENT_DATE - INTERVAL '30 days'),
+        'by_severity', severity_breakdown()
+    );
+$$ LANGUAGE sql STABLE;
+
 -- Create a table for monitoring logs
 CREATE TABLE IF NOT EXISTS monitoring_logs (
     id SERIAL PRIMARY KEY,
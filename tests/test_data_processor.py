@@ -0,0 +1,55 @@
+"""
+Tests for DataProcessor scoring.
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from data_processor import DataProcessor
+
+try:
+    import pandas  # noqa: F401
+except ImportError:
+    pandas = None
+
+_ACTIONS = [
+    'Notice of Assessment of Penalties', 'Curtailment', 'Lifting Curtailment', 'Cease & Desist',
+    'Directed Plan of Correction', 'Revocation', 'Suspension', 'Amended Notice of Assessment of Penalties',
+    'Revocation and Curtailment', '',
+]
+_PENALTIES = ['', '$500', '1,000', '$9,999', '10000', '$49,999', '50,000', '$250,000', 'TBD']
+_AGES = [None, timedelta(hours=3), timedelta(days=3), timedelta(days=6, hours=12), timedelta(days=30)]
+
+@unittest.skipUnless(pandas, "pandas is not installed")
+class ProcessEntriesTest(unittest.TestCase):
+    """process_entries must score every row exactly as process_entry does."""
+    
+    def test_matches_process_entry_row_by_row(self):
+        rng = random.Random(20250915)
+        now = datetime.now()
+        web_entries, pdf_datas = [], []
+        for index in range(500):
+            age = rng.choice(_AGES)
+            web_entries.append({
+                'facility_name': f'Facility {index}',
+                'date': now - age if age is not None else None,
+                'enforcement_action': rng.choice(_ACTIONS),
+                'pdf_url': f'https://example.org/{index}.pdf',
+            })
+            pdf_datas.append({
+                'enforcement_action_type': rng.choice(_ACTIONS),
+                'penalty_amount': rng.choice(_PENALTIES),
+                'key_violations': ['Failed to maintain staffing levels'] * rng.randint(0, 6),
+            })
+        
+        processor = DataProcessor()
+        df = processor.process_entries(web_entries, pdf_datas)
+        
+        for row, web_entry, pdf_data in zip(df.itertuples(), web_entries, pdf_datas):
+            structured = processor.process_entry(web_entry, pdf_data)['structured_data']
+            self.assertEqual(row.severity_level, structured['severity_level'], (web_entry, pdf_data))
+            self.assertEqual(row.priority_score, structured['priority_score'], (web_entry, pdf_data))
+
+if __name__ == '__main__':
+    unittest.main()
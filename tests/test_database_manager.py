@@ -0,0 +1,103 @@
+"""
+Tests for DatabaseManager queries, run against a fake Supabase client.
+"""
+
+import unittest
+from types import SimpleNamespace
+
+try:
+    import database_manager
+    from postgrest.exceptions import APIError  # noqa: F401
+except ImportError:
+    database_manager = None
+
+class _FakeQuery:
+    """Request builder whose execute() returns fixed data."""
+    
+    def __init__(self, data):
+        self._data = data
+    
+    def execute(self):
+        return SimpleNamespace(data=self._data)
+
+class _FakeClient:
+    """Supabase client stand-in; rpc() requires params, as in supabase 2.0.3."""
+    
+    def __init__(self, rpc_results):
+        self._rpc_results = rpc_results
+    
+    def rpc(self, fn, params):
+        return _FakeQuery(self._rpc_results[fn])
+
+class _FakeTable:
+    """Table query builder serving rows with postgrest-py 0.13's range(): offset start, limit end - start."""
+    
+    def __init__(self, rows, requests):
+        self._rows = rows
+        self._requests = requests
+    
+    def select(self, columns):
+        return self
+    
+    def eq(self, column, value):
+        return self
+    
+    def order(self, column, desc=False):
+        return self
+    
+    def range(self, start, end):
+        self._requests.append((start, end))
+        return _FakeQuery(self._rows[start:end])
+
+class _FakeTableClient:
+    """Supabase client stand-in for table queries."""
+    
+    def __init__(self, rows):
+        self._rows = rows
+        self.requests = []
+    
+    def table(self, name):
+        return _FakeTable(self._rows, self.requests)
+
+def _manager(client) -> 'database_manager.DatabaseManager':
+    # Skips __init__, which connects to Supabase
+    manager = database_manager.DatabaseManager.__new__(database_manager.DatabaseManager)
+    manager.supabase = client
+    return manager
+
+@unittest.skipUnless(database_manager, "database dependencies are not installed")
+class StatisticsTest(unittest.TestCase):
+    
+    def setUp(self):
+        database_manager._invalidate_read_cache()
+    
+    def test_get_statistics_returns_rpc_summary(self):
+        manager = _manager(_FakeClient({'stats_summary': {
+            'total': 12, 'recent_30': 4, 'by_severity': {'HIGH': 3, 'LOW': 9}
+        }}))
+        
+        stats = manager.get_statistics()
+        
+        self.assertEqual(stats['total_entries'], 12)
+        self.assertEqual(stats['recent_entries_30_days'], 4)
+        self.assertEqual(stats['severity_breakdown'], {'HIGH': 3, 'LOW': 9})
+    
+    def test_get_severity_breakdown_returns_rpc_counts(self):
+        manager = _manager(_FakeClient({'severity_breakdown': {'HIGH': 2, 'MEDIUM': 5}}))
+        
+        self.assertEqual(manager.get_severity_breakdown(), {'HIGH': 2, 'MEDIUM': 5})
+
+@unittest.skipUnless(database_manager, "database dependencies are not installed")
+class PaginationTest(unittest.TestCase):
+    
+    def test_reads_every_page(self):
+        rows = [{'id': str(index)} for index in range(1234)]
+        client = _FakeTableClient(rows)
+        
+        result = list(_manager(client).iter_high_priority_entries(page_size=500))
+        
+        self.assertEqual(result, rows)
+        self.assertEqual(client.requests, [(0, 500), (500, 1000), (1000, 1500)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Tests for the PDF text-parsing patterns.
+"""
+
+import re
+import random
+import unittest
+
+import pdf_parser
+from config import Config
+
+def _first_group(patterns, text: str, flags: int = 0):
+    """Return group(1) of the first pattern that matches, searching in priority order."""
+    for pattern in patterns:
+        match = re.search(pattern, text, flags)
+        if match:
+            return match.group(1)
+    return None
+
+# Tokens that exercise keyword boundaries, long whitespace runs (as kept by
+# preserve_interword_spaces) and names split across lines
+_ADMIN_TOKENS = [
+    "Administrator", "Administrator:", "Administrator -", "Director", "CEO",
+    "Contact Person", "Chief Executive Officer", "Sincerely,", "Best regards,",
+    "Jane", "Doe", "Doeberman", "John", "Smith", "jane", "the", "of", "12", "1.",
+    "$5,000", ",", ":", "-", ".", " ", "\n", "\n\n", "\t", " " * 40, " " * 250,
+]
+
+def _random_text(rng: random.Random, tokens: list, max_tokens: int = 40) -> str:
+    return "".join(rng.choice(tokens) + rng.choice(["", " ", "\n"])
+                   for _ in range(rng.randint(1, max_tokens)))
+
+# Field tokens: labels, amounts and dates, with the separators around them
+_FIELD_TOKENS = [
+    "penalty of", "assessed penalty of", "Fine of", "penalty", "$", "$5,000", "12,500",
+    "Effective Date:", "Date:", "1/2/2025", "12/31/2024", "Violations:", "Deficiency:",
+    "Findings:", "Issues:", "Contact:", "For questions:", "Inquiries:", "Jane Doe",
+    "staff", "Curtailment", "Lifting Curtailment", "Cease & Desist", "Revocation",
+    "Suspension", "Notice of Assessment of Penalties", "Directed Plan of Correction",
+    " ", "\n", "\n\n", ":",
+]
+
+class FieldPatternsTest(unittest.TestCase):
+    """The precompiled field patterns must pick what the original per-call lists did."""
+    
+    # Original lists from _parse_text_content and its helpers
+    OLD_PENALTY_PATTERNS = [
+        r'penalty\s*of\s*\$?([0-9,]+)',
+        r'fine\s*of\s*\$?([0-9,]+)',
+        r'\$([0-9,]+)\s*penalty',
+        r'assessed\s*penalty\s*of\s*\$?([0-9,]+)',
+    ]
+    OLD_ACTION_PATTERNS = [
+        r'Notice\s+of\s+Assessment\s+of\s+Penalties',
+        r'Curtailment',
+        r'Cease\s+&\s+Desist',
+        r'Directed\s+Plan\s+of\s+Correction',
+        r'Lifting\s+Curtailment',
+        r'Revocation',
+        r'Suspension',
+    ]
+    OLD_DATE_PATTERNS = [
+        r'Effective\s+Date:\s*([0-9/]+)',
+        r'Date:\s*([0-9/]+)',
+        r'([0-9]{1,2}/[0-9]{1,2}/[0-9]{4})',
+    ]
+    OLD_SECTION_PATTERNS = [
+        r'Violations?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+        r'Deficiencies?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+        r'Findings?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+        r'Issues?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    ]
+    OLD_CONTACT_PATTERNS = [
+        r'Contact:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+        r'For\s+questions?:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+        r'Inquiries:\s*(.+?)(?=\n\n|\n[A-Z]|$)',
+    ]
+    
+    def test_matches_original_lists_on_random_text(self):
+        section_flags = re.IGNORECASE | re.MULTILINE | re.DOTALL
+        rng = random.Random(20250916)
+        for _ in range(5000):
+            text = _random_text(rng, _FIELD_TOKENS)
+            self.assertEqual(_first_group(pdf_parser._PENALTY_PATTERNS, text),
+                             _first_group(self.OLD_PENALTY_PATTERNS, text, re.IGNORECASE), repr(text))
+            self.assertEqual(next((label for pattern, label in pdf_parser._ACTION_PATTERNS
+                                   if pattern.search(text)), None),
+                             next((pattern.replace(r'\s+', ' ') for pattern in self.OLD_ACTION_PATTERNS
+                                   if re.search(pattern, text, re.IGNORECASE)), None), repr(text))
+            self.assertEqual(_first_group(pdf_parser._DATE_PATTERNS, text),
+                             _first_group(self.OLD_DATE_PATTERNS, text, re.IGNORECASE), repr(text))
+            self.assertEqual(_first_group(pdf_parser._VIOLATION_SECTION_PATTERNS, text),
+                             _first_group(self.OLD_SECTION_PATTERNS, text, section_flags), repr(text))
+            self.assertEqual(_first_group(pdf_parser._CONTACT_PATTERNS, text),
+                             _first_group(self.OLD_CONTACT_PATTERNS, text, section_flags), repr(text))
+
+class KeyViolationsTest(unittest.TestCase):
+    """_extract_key_violations must return what the original DOTALL patterns did."""
+    
+    OLD_PATTERNS = [
+        r'(?:^|\n)\s*[0-9]+\.\s*(.+?)(?=\n\s*[0-9]+\.|\n\n|$)',
+        r'(?:^|\n)\s*[•\-\*]\s*(.+?)(?=\n\s*[•\-\*]|\n\n|$)',
+        r'(?:^|\n)\s*[a-z]\)\s*(.+?)(?=\n\s*[a-z]\)|\n\n|$)',
+    ]
+    TOKENS = [
+        "1.", "12.", "-", "*", "•", "a)", "b)", "Failed to maintain staffing levels",
+        "medication errors were observed", "x", " ", "  ", "\t", "\r", "\n", "\n\n",
+        "\u00a0",
+    ]
+    
+    def _old_key_violations(self, text: str) -> list:
+        violations = []
+        for pattern in self.OLD_PATTERNS:
+            for match in re.findall(pattern, text, re.MULTILINE | re.DOTALL):
+                if len(match.strip()) > 20:
+                    violations.append(match.strip())
+        return violations[:Config.MAX_VIOLATIONS_TO_EXTRACT]
+    
+    def test_matches_original_patterns_on_random_text(self):
+        parser = pdf_parser.PDFParser()
+        rng = random.Random(20250918)
+        for _ in range(5000):
+            text = _random_text(rng, self.TOKENS, max_tokens=60)
+            self.assertEqual(parser._extract_key_violations(text),
+                             self._old_key_violations(text), repr(text))
+
+class AdminPatternFamilyTest(unittest.TestCase):
+    """_ADMIN_PATTERNS must pick the name the original two pattern lists did."""
+    
+    # Original administrator list, then the signature fallbacks
+    OLD_ADMIN_PATTERNS = [
+        r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
+        r'Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Nursing\s+Home\s+Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Facility\s+Administrator[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Administrator\s*[-:]\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Contact\s+Person[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Director[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'CEO[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Chief\s+Executive\s+Officer[:\s]*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'^([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
+        r'^([A-Z][a-z]+\s+[A-Z][a-z]+)\s*\n.*Administrator',
+        r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator',
+        r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*Administrator\s*\n.*Health\s+Center',
+        r'([A-Z][a-zA-Z]+\s+[A-Z][a-zA-Z]+),?\s*Administrator',
+    ]
+    OLD_SIGNATURE_PATTERNS = [
+        r'Sincerely,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'Best\s+regards,\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
+        r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(Administrator|Director|CEO)',
+    ]
+    
+    def test_matches_original_lists_on_random_text(self):
+        flags = re.IGNORECASE | re.MULTILINE
+        tokens = _ADMIN_TOKENS + ["Nursing Home", "Facility", "Health Center", "McDonald"]
+        rng = random.Random(20250917)
+        for _ in range(5000):
+            text = _random_text(rng, tokens)
+            expected = (_first_group(self.OLD_ADMIN_PATTERNS, text, flags)
+                        or _first_group(self.OLD_SIGNATURE_PATTERNS, text, flags))
+            self.assertEqual(pdf_parser._ADMIN_PATTERNS.search(text)[1], expected, repr(text))
+
+class SearchAdminPatternsTest(unittest.TestCase):
+    """_search_admin_patterns must agree with a full-text _ADMIN_PATTERNS search."""
+    
+    def assertSameAsFullSearch(self, text: str):
+        self.assertEqual(pdf_parser._search_admin_patterns(text),
+                         pdf_parser._ADMIN_PATTERNS.search(text), repr(text))
+    
+    def test_name_after_long_whitespace_run(self):
+        text = "Administrator:" + " " * 190 + "Jane Doeberman"
+        self.assertEqual(pdf_parser._search_admin_patterns(text), (1, "Jane Doeberman"))
+    
+    def test_signature_after_long_blank_line(self):
+        text = "Sincerely,\n" + " " * 198 + "\nJane Doe"
+        self.assertEqual(pdf_parser._search_admin_patterns(text), (8, "Jane Doe"))
+    
+    def test_name_far_before_title(self):
+        self.assertSameAsFullSearch("Notice.\nJane" + " " * 300 + "Doe, Administrator")
+    
+    def test_name_on_line_before_title(self):
+        self.assertSameAsFullSearch("Re: notice 12.\nJane Doe\n3 East St. Administrator")
+    
+    def test_no_keyword(self):
+        self.assertEqual(pdf_parser._search_admin_patterns("Jane Doe signed on 1/2/2025."),
+                         (None, None))
+    
+    def test_matches_full_search_on_random_text(self):
+        rng = random.Random(20250915)
+        for _ in range(5000):
+            self.assertSameAsFullSearch(_random_text(rng, _ADMIN_TOKENS))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,93 +4,259 @@ Handles scraping the main page and downloading PDFs.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import lxml.html
+from lxml import etree
 import logging
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 import os
+import json
+import time
+import atexit
+import socket
 import hashlib
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+def _flush_if_alive(flush_ref):
+    """atexit hook: flush a scraper's last check date if the scraper still exists."""
+    flush = flush_ref()
+    if flush is not None:
+        flush()
+
+# getaddrinfo results for the scraped host, as (monotonic expiry, addresses)
+_dns_cache = {}
+_dns_cache_lock = threading.Lock()
+_dns_cached_hosts = set()
+_system_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo that reuses recent answers for the scraped host."""
+    if host not in _dns_cached_hosts:
+        return _system_getaddrinfo(host, port, family, type, proto, flags)
+    
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_cache_lock:
+        cached = _dns_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    # Failures are not cached, so the next connection retries the lookup
+    addresses = _system_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_cache_lock:
+        _dns_cache[key] = (now + Config.DNS_CACHE_TTL, addresses)
+    return addresses
+
+def _cache_dns_for(host):
+    """Route lookups of one host through the DNS cache; other hosts resolve as usual."""
+    with _dns_cache_lock:
+        _dns_cached_hosts.add(host)
+        if socket.getaddrinfo is not _cached_getaddrinfo:
+            socket.getaddrinfo = _cached_getaddrinfo
+
+class _PDFNotModified(Exception):
+    """The server answered a conditional PDF request with 304 Not Modified."""
+
+def _entry_hash(entry):
+    """Stable identity of a listing row, used to skip rows already returned."""
+    key = f"{entry['date'].date()}|{entry['facility_name']}|{entry['pdf_url']}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+# Listing page queries, compiled once rather than on every parse
+_FIRST_TABLE_XPATH = etree.XPath('(//table)[1]')
+_ROWS_XPATH = etree.XPath('.//tr')
+_CELLS_XPATH = etree.XPath('.//td')
+_LINKS_XPATH = etree.XPath('.//a')
+_TEXT_XPATH = etree.XPath('.//text()')
+
+def _text(element):
+    """Stripped text of an element, joined like BeautifulSoup's get_text(strip=True)."""
+    return ''.join(text.strip() for text in _TEXT_XPATH(element))
+
 class NJHealthScraper:
     """Scraper for the NJ Health Facility Enforcement Actions website."""
     
     def __init__(self):
         self.base_url = "https://www.nj.gov/health/healthfacilities/surveys-insp/enforcement_actions.shtml"
+        # New pooled connections (after idle timeouts, or concurrent downloads)
+        # skip the resolver while the cached answer is fresh
+        _cache_dns_for(urlparse(self.base_url).hostname)
         self.session = requests.Session()
+        # Size the pool so concurrent PDF downloads share connections, and retry
+        # transient failures on a kept-alive connection instead of failing the entry
+        retries = Retry(total=Config.MAX_RETRIES, backoff_factor=0.3,
+                        status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=4,
+                              pool_maxsize=Config.PROCESSING_MAX_WORKERS,
+                              max_retries=retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            # Every coding urllib3 can decode here: gzip and deflate, plus br with brotli
+            'Accept-Encoding': ACCEPT_ENCODING
         })
         self.last_check_file = "last_check.txt"
+        # Last check date, read once; changes are written by flush_last_check_date
+        self._last_check = None
+        self._last_check_dirty = False
+        # Callers flush after each check; exit is only a backstop, as SIGTERM skips
+        # atexit. The scraper is held weakly so the hook does not keep it alive.
+        atexit.register(_flush_if_alive, weakref.WeakMethod(self.flush_last_check_date))
+        # ETag / Last-Modified of the listing page as of the last completed check,
+        # and those of the page fetched by the check in progress
+        self.validators_file = "listing_validators.json"
+        self._pending_validators = None
+        # Recently fetched listing page, as (monotonic fetch time, HTML)
+        self._page_cache = (0.0, None)
+        # Hashes of entries recorded by mark_processed, one per line
+        self.seen_entries_file = "seen_entries.txt"
+        self._seen = self._load_seen_entries()
+        # Entries returned by the current check that are not yet processed, by hash,
+        # and when that check started; finish_check settles both
+        self._pending = {}
+        self._check_started = None
+        # Optional store of downloaded PDFs and their validators, for conditional re-downloads
+        self.pdf_cache_dir = os.getenv('PDF_DOWNLOAD_CACHE_DIR')
+        self._pdf_cache_lock = threading.Lock()
+        self._pdf_cache = {}
+        if self.pdf_cache_dir:
+            os.makedirs(self.pdf_cache_dir, exist_ok=True)
+            self._pdf_cache = self._load_pdf_cache()
+        
+    def get_page_content(self, conditional=False):
+        """
+        Fetch the main page content.
         
-    def get_page_content(self):
-        """Fetch the main page content."""
+        Args:
+            conditional: Revalidate against the saved validators, and hold the
+                new ones until finish_check saves them
+            
+        Returns:
+            The page HTML, or None if the page is unchanged since that fetch
+        """
         try:
-            response = self.session.get(self.base_url, timeout=30)
+            headers = {}
+            if conditional:
+                validators = self._load_validators()
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    headers['If-Modified-Since'] = validators['last_modified']
+            
+            response = self.session.get(self.base_url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                logger.info("Listing page not modified since last check")
+                return None
             response.raise_for_status()
+            
+            if conditional:
+                # Saved only once the check succeeds, so a failed run refetches the page
+                self._pending_validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
             return response.text
         except requests.RequestException as e:
             logger.error(f"Error fetching page content: {str(e)}")
             raise
     
-    def parse_entries(self, html_content):
-        """Parse the HTML content to extract enforcement action entries."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        entries = []
+    def _load_validators(self):
+        """Load the saved listing page validators."""
+        try:
+            with open(self.validators_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Error reading listing validators: {str(e)}")
+            return {}
+    
+    def _save_validators(self, validators):
+        """Save the listing page validators."""
+        try:
+            with open(self.validators_file, 'w') as f:
+                json.dump(validators, f)
+        except Exception as e:
+            logger.warning(f"Error saving listing validators: {str(e)}")
+    
+    def parse_entries(self, html_content, stop_before=None):
+        """
+        Parse the HTML content, yielding enforcement action entries.
+        
+        Args:
+            html_content: HTML of the listing page
+            stop_before: If given, stop at the first row dated before it; the
+                listing is ordered newest first
+        """
+        # lxml builds the tree in C; only the first table's rows are visited
+        document = lxml.html.fromstring(html_content)
         
         # Find the table containing enforcement actions
-        table = soup.find('table')
-        if not table:
+        tables = _FIRST_TABLE_XPATH(document)
+        if not tables:
             logger.warning("No table found on the page")
-            return entries
+            return
         
         # Parse table rows
-        rows = table.find_all('tr')[1:]  # Skip header row
+        rows = _ROWS_XPATH(tables[0])[1:]  # Skip header row
         
         for row in rows:
-            cells = row.find_all('td')
-            if len(cells) >= 3:
-                try:
-                    date_str = cells[0].get_text(strip=True)
-                    facility_name_cell = cells[1]
-                    enforcement_action = cells[2].get_text(strip=True)
-                    
-                    # Extract facility name and PDF URL
-                    facility_link = facility_name_cell.find('a')
-                    if facility_link:
-                        facility_name = facility_link.get_text(strip=True)
-                        pdf_url = facility_link.get('href')
-                        
-                        # Convert relative URL to absolute
-                        if pdf_url and not pdf_url.startswith('http'):
-                            pdf_url = urljoin(self.base_url, pdf_url)
-                        
-                        # Parse date
-                        try:
-                            entry_date = datetime.strptime(date_str, '%m/%d/%Y')
-                        except ValueError:
-                            logger.warning(f"Could not parse date: {date_str}")
-                            continue
-                        
-                        entry = {
-                            'date': entry_date,
-                            'facility_name': facility_name,
-                            'enforcement_action': enforcement_action,
-                            'pdf_url': pdf_url,
-                            'scraped_at': datetime.now()
-                        }
-                        
-                        entries.append(entry)
-                        
-                except Exception as e:
-                    logger.warning(f"Error parsing row: {str(e)}")
-                    continue
-        
-        return entries
+            # Skip rows that are not enforcement entries (spacers, notes)
+            cells = _CELLS_XPATH(row)
+            if len(cells) < 3:
+                continue
+            
+            # Extract facility name and PDF URL
+            facility_links = _LINKS_XPATH(cells[1])
+            if not facility_links:
+                continue
+            facility_link = facility_links[0]
+            
+            # Parse date
+            date_str = _text(cells[0])
+            try:
+                # MM/DD/YYYY; split is much cheaper than strptime per row
+                month, day, year = date_str.split('/')
+                entry_date = datetime(int(year), int(month), int(day))
+            except ValueError:
+                logger.warning(f"Could not parse date: {date_str}")
+                continue
+            
+            # Every following row is older still
+            if stop_before is not None and entry_date < stop_before:
+                break
+            
+            # Convert relative URL to absolute
+            pdf_url = facility_link.get('href')
+            if pdf_url and not pdf_url.startswith('http'):
+                pdf_url = urljoin(self.base_url, pdf_url)
+            
+            yield {
+                'date': entry_date,
+                'facility_name': _text(facility_link),
+                'enforcement_action': _text(cells[2]),
+                'pdf_url': pdf_url,
+                'scraped_at': datetime.now()
+            }
     
     def get_last_check_date(self):
         """Get the date of the last successful check."""
+        if self._last_check is None:
+            self._last_check = self._read_last_check_date()
+        return self._last_check
+    
+    def _read_last_check_date(self):
+        """Read the last check date from disk."""
         try:
             if os.path.exists(self.last_check_file):
                 with open(self.last_check_file, 'r') as f:
@@ -104,34 +270,102 @@ class NJHealthScraper:
         return cutoff_date
     
     def save_last_check_date(self, date):
-        """Save the current check date."""
+        """Record the current check date; it is written to disk by flush_last_check_date."""
+        self._last_check = date
+        self._last_check_dirty = True
+    
+    def flush_last_check_date(self):
+        """Write the last check date to disk if it changed; call once a check completes."""
+        if not self._last_check_dirty:
+            return
         try:
             with open(self.last_check_file, 'w') as f:
-                f.write(date.isoformat())
+                f.write(self._last_check.isoformat())
+            self._last_check_dirty = False
         except Exception as e:
             logger.warning(f"Error saving last check date: {str(e)}")
     
-    def get_new_entries(self):
-        """Get new entries since the last check."""
+    def _load_seen_entries(self):
+        """Load the hashes of entries already processed."""
+        try:
+            with open(self.seen_entries_file, 'r') as f:
+                return {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            logger.warning(f"Error reading seen entries: {str(e)}")
+            return set()
+    
+    def _save_seen_entries(self, entry_hashes):
+        """Append newly processed entry hashes to the seen-entries file."""
+        if not entry_hashes:
+            return
         try:
-            # Get page content
-            html_content = self.get_page_content()
+            with open(self.seen_entries_file, 'a') as f:
+                f.write(''.join(f"{entry_hash}\n" for entry_hash in entry_hashes))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.warning(f"Error saving seen entries: {str(e)}")
+    
+    def _load_entries(self, min_date=None, conditional=False):
+        """
+        Fetch and parse listing entries dated on or after min_date.
+        
+        The page is fetched at most once per Config.LISTING_CACHE_TTL, so a
+        backfill followed by a poll in the same cycle shares one download.
+        
+        Args:
+            min_date: Earliest entry date to return, or None for all entries
+            conditional: Revalidate the page (see get_page_content) when fetching
             
-            # Parse all entries
-            all_entries = self.parse_entries(html_content)
+        Returns:
+            Iterator over entries, or None if a conditional fetch found the page unchanged
+        """
+        fetched_at, html_content = self._page_cache
+        if html_content is None or time.monotonic() - fetched_at > Config.LISTING_CACHE_TTL:
+            html_content = self.get_page_content(conditional=conditional)
+            if html_content is None:
+                return None
+            self._page_cache = (time.monotonic(), html_content)
+        
+        # Lazy, so callers can stop parsing early
+        entries = self.parse_entries(html_content, stop_before=min_date)
+        if min_date is None:
+            return entries
+        return (entry for entry in entries if entry['date'] >= min_date)
+    
+    def get_new_entries(self):
+        """
+        Get new entries since the last check.
+        
+        An entry keeps being returned by later checks until mark_processed
+        records it. Call finish_check once the returned entries are handled.
+        """
+        try:
+            check_started = datetime.now()
             
             # Get last check date
             last_check = self.get_last_check_date()
             
             # Filter for new entries from September 15, 2025 forward
             cutoff_date = datetime(2025, 9, 15)
-            new_entries = [
-                entry for entry in all_entries 
-                if entry['date'] >= cutoff_date and entry['date'] > last_check
-            ]
             
-            # Update last check date
-            self.save_last_check_date(datetime.now())
+            self._pending = {}
+            self._pending_validators = None
+            self._check_started = check_started
+            
+            # Skip the check entirely when the page is unchanged
+            all_entries = self._load_entries(max(cutoff_date, last_check), conditional=True)
+            if all_entries is None:
+                return []
+            
+            for entry in all_entries:
+                if entry['date'] > last_check:
+                    entry_hash = _entry_hash(entry)
+                    if entry_hash not in self._seen:
+                        self._pending[entry_hash] = entry
+            new_entries = list(self._pending.values())
             
             logger.info(f"Found {len(new_entries)} new entries since {last_check} (from 9/15/2025 forward)")
             return new_entries
@@ -140,23 +374,56 @@ class NJHealthScraper:
             logger.error(f"Error getting new entries: {str(e)}")
             raise
     
+    def mark_processed(self, entries):
+        """
+        Record entries as processed so later checks skip them.
+        
+        Args:
+            entries: Entries returned by get_new_entries that were stored
+        """
+        new_hashes = []
+        for entry in entries:
+            entry_hash = _entry_hash(entry)
+            self._pending.pop(entry_hash, None)
+            if entry_hash not in self._seen:
+                self._seen.add(entry_hash)
+                new_hashes.append(entry_hash)
+        
+        self._save_seen_entries(new_hashes)
+    
+    def finish_check(self):
+        """
+        Advance the last check date and save the listing validators after a
+        check has handled its entries.
+        
+        Entries from that check that were never marked processed stay inside
+        the next check's date window, so they are returned again. The old
+        validators are kept in that case, so the next check is not answered
+        with 304 Not Modified.
+        """
+        if self._check_started is None:
+            return
+        
+        check_date = self._check_started
+        if self._pending:
+            earliest = min(entry['date'] for entry in self._pending.values())
+            check_date = min(check_date, earliest - timedelta(microseconds=1))
+        elif self._pending_validators is not None:
+            self._save_validators(self._pending_validators)
+        
+        self.save_last_check_date(check_date)
+        self._pending = {}
+        self._pending_validators = None
+        self._check_started = None
+    
     def get_entries_from_date(self, start_date=None):
         """Get all entries from a specific date forward."""
         try:
             if start_date is None:
                 start_date = datetime(2025, 9, 15)  # Default to September 15, 2025
             
-            # Get page content
-            html_content = self.get_page_content()
-            
-            # Parse all entries
-            all_entries = self.parse_entries(html_content)
-            
-            # Filter entries from the specified date forward
-            filtered_entries = [
-                entry for entry in all_entries 
-                if entry['date'] >= start_date
-            ]
+            # Entries from the specified date forward
+            filtered_entries = list(self._load_entries(start_date))
             
             logger.info(f"Found {len(filtered_entries)} entries from {start_date.strftime('%m/%d/%Y')} forward")
             return filtered_entries
@@ -165,22 +432,166 @@ class NJHealthScraper:
             logger.error(f"Error getting entries from date: {str(e)}")
             raise
     
-    def download_pdf(self, pdf_url):
-        """Download PDF content from URL."""
-        try:
-            if not pdf_url:
-                raise ValueError("No PDF URL provided")
+    def _iter_pdf_chunks(self, pdf_url, headers=None, validators=None):
+        """
+        Stream a PDF from URL in chunks, rejecting files over the size limit.
+        
+        Args:
+            pdf_url: URL of the PDF
+            headers: Extra request headers, e.g. conditional ones
+            validators: If given, filled with the response's etag and last_modified
             
-            logger.info(f"Downloading PDF from: {pdf_url}")
-            response = self.session.get(pdf_url, timeout=60)
+        Raises:
+            _PDFNotModified: The server answered a conditional request with 304
+        """
+        if not pdf_url:
+            raise ValueError("No PDF URL provided")
+        
+        max_bytes = Config.MAX_PDF_SIZE_MB * 1024 * 1024
+        
+        logger.info(f"Downloading PDF from: {pdf_url}")
+        with self.session.get(pdf_url, headers=headers, stream=True,
+                              timeout=Config.PDF_DOWNLOAD_TIMEOUT) as response:
+            if response.status_code == 304:
+                raise _PDFNotModified(pdf_url)
             response.raise_for_status()
             
+            if validators is not None:
+                validators['etag'] = response.headers.get('ETag')
+                validators['last_modified'] = response.headers.get('Last-Modified')
+            
             # Check if it's actually a PDF
             content_type = response.headers.get('content-type', '').lower()
             if 'pdf' not in content_type:
                 logger.warning(f"URL may not be a PDF. Content-Type: {content_type}")
             
-            return response.content
+            # Fail fast when the server announces an oversize body
+            content_length = int(response.headers.get('content-length') or 0)
+            if content_length > max_bytes:
+                raise ValueError(f"PDF exceeds {Config.MAX_PDF_SIZE_MB} MB limit: {pdf_url}")
+            
+            received = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ValueError(f"PDF exceeds {Config.MAX_PDF_SIZE_MB} MB limit: {pdf_url}")
+                yield chunk
+    
+    def download_pdf(self, pdf_url):
+        """Download PDF content from URL, rejecting files over the size limit."""
+        try:
+            if self.pdf_cache_dir:
+                return self._download_pdf_cached(pdf_url)
+            return b''.join(self._iter_pdf_chunks(pdf_url))
+            
+        except requests.RequestException as e:
+            logger.error(f"Error downloading PDF from {pdf_url}: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error downloading PDF: {str(e)}")
+            raise
+    
+    def _download_pdf_cached(self, pdf_url):
+        """Download a PDF, revalidating a cached copy with If-None-Match / If-Modified-Since."""
+        with self._pdf_cache_lock:
+            cached = self._pdf_cache.get(pdf_url)
+        
+        headers = {}
+        cached_path = None
+        if cached:
+            cached_path = os.path.join(self.pdf_cache_dir, f"{cached['sha256']}.pdf")
+            if os.path.exists(cached_path):
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+        
+        validators = {}
+        try:
+            content = b''.join(self._iter_pdf_chunks(pdf_url, headers or None, validators))
+        except _PDFNotModified:
+            logger.info(f"PDF not modified, using cached copy: {pdf_url}")
+            with open(cached_path, 'rb') as f:
+                return f.read()
+        
+        # Only responses the server can revalidate are worth keeping
+        if validators.get('etag') or validators.get('last_modified'):
+            sha256 = hashlib.sha256(content).hexdigest()
+            path = os.path.join(self.pdf_cache_dir, f"{sha256}.pdf")
+            try:
+                if not os.path.exists(path):
+                    tmp_path = f"{path}.part"
+                    with open(tmp_path, 'wb') as f:
+                        f.write(content)
+                    os.replace(tmp_path, path)
+                with self._pdf_cache_lock:
+                    self._pdf_cache[pdf_url] = dict(validators, sha256=sha256)
+                    self._save_pdf_cache()
+            except OSError as e:
+                logger.warning(f"Could not cache PDF {pdf_url}: {str(e)}")
+        
+        return content
+    
+    def _load_pdf_cache(self):
+        """Load the URL -> {etag, last_modified, sha256} map of cached PDFs."""
+        try:
+            with open(os.path.join(self.pdf_cache_dir, "pdf_cache.json"), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Error reading PDF cache index: {str(e)}")
+            return {}
+    
+    def _save_pdf_cache(self):
+        """Write the cached PDF index atomically; caller holds _pdf_cache_lock."""
+        index_path = os.path.join(self.pdf_cache_dir, "pdf_cache.json")
+        tmp_path = f"{index_path}.part"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._pdf_cache, f)
+        os.replace(tmp_path, index_path)
+    
+    def download_pdf_to(self, pdf_url, path):
+        """
+        Stream a PDF from URL straight to a file, holding one chunk in memory at a time.
+        
+        Args:
+            pdf_url: URL of the PDF
+            path: Destination file; only replaced once the download completes
+            
+        Returns:
+            Number of bytes written
+        """
+        return self._save_pdf(pdf_url, path)
+    
+    def download_pdf_and_hash(self, pdf_url, path):
+        """
+        Stream a PDF to a file, computing its SHA-256 from the same chunks.
+        
+        Args:
+            pdf_url: URL of the PDF
+            path: Destination file; only replaced once the download completes
+            
+        Returns:
+            Tuple of (path, hex SHA-256 of the PDF)
+        """
+        digest = hashlib.sha256()
+        self._save_pdf(pdf_url, path, digest)
+        return path, digest.hexdigest()
+    
+    def _save_pdf(self, pdf_url, path, digest=None):
+        """Write a streamed PDF to path via a temporary file, feeding digest if given."""
+        tmp_path = f"{path}.part"
+        try:
+            written = 0
+            with open(tmp_path, 'wb') as f:
+                for chunk in self._iter_pdf_chunks(pdf_url):
+                    f.write(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                    written += len(chunk)
+            os.replace(tmp_path, path)
+            return written
             
         except requests.RequestException as e:
             logger.error(f"Error downloading PDF from {pdf_url}: {str(e)}")
@@ -188,12 +599,43 @@ class NJHealthScraper:
         except Exception as e:
             logger.error(f"Unexpected error downloading PDF: {str(e)}")
             raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    
+    def download_pdfs(self, entries, max_workers=Config.PROCESSING_MAX_WORKERS):
+        """
+        Download the PDFs for several entries concurrently over the pooled session.
+        
+        Args:
+            entries: Entries with a 'pdf_url'
+            max_workers: Maximum concurrent downloads, capped at the connection pool size
+            
+        Returns:
+            Dictionary mapping each successfully downloaded URL to its PDF content
+        """
+        urls = list(dict.fromkeys(entry['pdf_url'] for entry in entries if entry.get('pdf_url')))
+        if not urls:
+            return {}
+        
+        pdfs = {}
+        max_workers = max(1, min(max_workers, len(urls), Config.PROCESSING_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.download_pdf, url): url for url in urls}
+            for future in as_completed(futures):
+                # download_pdf logs its own errors; one failure does not stop the batch
+                try:
+                    pdfs[futures[future]] = future.result()
+                except Exception:
+                    continue
+        
+        logger.info(f"Downloaded {len(pdfs)} of {len(urls)} PDFs")
+        return pdfs
     
     def get_all_entries(self):
         """Get all entries from the website (for testing purposes)."""
         try:
-            html_content = self.get_page_content()
-            return self.parse_entries(html_content)
+            return list(self._load_entries())
         except Exception as e:
             logger.error(f"Error getting all entries: {str(e)}")
             raise